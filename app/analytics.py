@@ -1,5 +1,5 @@
 from collections import Counter
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 def compute_analytics(jobs: List[Dict]) -> Dict:
     total = len(jobs)
@@ -12,3 +12,160 @@ def compute_analytics(jobs: List[Dict]) -> Dict:
         "jobs_per_type": dict(per_type.most_common(50)),
         "jobs_per_location": dict(per_location.most_common(50))
     }
+
+
+class _RankedCounter:
+    """
+    Counter with O(1) increment/decrement that keeps keys bucketed by count,
+    so the top K are read by walking the non-empty buckets down from the
+    highest count instead of sorting every key.
+
+    The bucket counts are sorted lazily, on the first top() after a bucket
+    appeared or emptied: there are at most ~sqrt(2 * total) distinct counts,
+    and keeping them sorted on every increment would slow down a recount.
+    """
+    __slots__ = ("counts", "buckets", "_levels")
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.buckets: Dict[int, Dict[str, None]] = {}
+        self._levels: Optional[List[int]] = []  # bucket counts, descending; None: stale
+
+    def _move(self, key: str, old: int, new: int):
+        if old:
+            bucket = self.buckets[old]
+            del bucket[key]
+            if not bucket:
+                del self.buckets[old]
+                self._levels = None
+        if new:
+            bucket = self.buckets.get(new)
+            if bucket is None:
+                bucket = self.buckets[new] = {}
+                self._levels = None
+            bucket[key] = None
+
+    def add(self, key: str):
+        old = self.counts.get(key, 0)
+        self.counts[key] = old + 1
+        self._move(key, old, old + 1)
+
+    def remove(self, key: str):
+        old = self.counts.get(key, 0)
+        if not old:
+            return
+        if old > 1:
+            self.counts[key] = old - 1
+        else:
+            del self.counts[key]
+        self._move(key, old, old - 1)
+
+    def top(self, k: int) -> Dict[str, int]:
+        """O(K) once the levels are sorted: every bucket visited yields a key."""
+        levels = self._levels
+        if levels is None:
+            levels = self._levels = sorted(self.buckets, reverse=True)
+        result: Dict[str, int] = {}
+        for count in levels:
+            for key in self.buckets[count]:
+                result[key] = count
+                if len(result) == k:
+                    return result
+        return result
+
+
+# Dimensions counted by the engine: stats key -> job field
+_DIMENSIONS = (
+    ("jobs_per_company", "company"),
+    ("jobs_per_type", "jobType"),
+    ("jobs_per_location", "location"),
+    ("jobs_per_source", "source"),
+    ("jobs_per_category", "jobCategory"),
+)
+
+
+class _Counts:
+    __slots__ = ("total", "dims")
+
+    def __init__(self):
+        self.total = 0
+        self.dims = {name: _RankedCounter() for name, _ in _DIMENSIONS}
+
+
+class AnalyticsEngine:
+    """
+    Incrementally maintained job statistics.
+
+    Keeps per-dimension counts overall and cross-tabbed by jobCategory and by
+    source, updated as jobs are added or removed between ingests. Reads never
+    rescan jobs: top-K walks the count buckets, and filtered stats (e.g. only
+    Remote jobs) come from the matching cross-tab.
+    """
+
+    def __init__(self):
+        # (category, source) -> counts; None means "any"
+        self._tabs: Dict[tuple, _Counts] = {}
+
+    @staticmethod
+    def _values(job) -> tuple:
+        return tuple(job.get(field, "Unknown") or "Unknown" for _, field in _DIMENSIONS)
+
+    def _tab_keys(self, values: tuple) -> tuple:
+        # Lowercased like SearchIndex's facets, so ?category=remote finds "Remote"
+        category, source = values[4].lower(), values[3].lower()
+        return (None, None), (category, None), (None, source), (category, source)
+
+    def _apply(self, values: tuple, delta: int):
+        for tab_key in self._tab_keys(values):
+            counts = self._tabs.get(tab_key)
+            if counts is None:
+                if delta < 0:
+                    continue
+                counts = self._tabs[tab_key] = _Counts()
+            counts.total += delta
+            for (name, _), value in zip(_DIMENSIONS, values):
+                if delta > 0:
+                    counts.dims[name].add(value)
+                else:
+                    counts.dims[name].remove(value)
+            if counts.total <= 0:
+                del self._tabs[tab_key]
+
+    def add(self, job):
+        self._apply(self._values(job), 1)
+
+    def remove(self, job):
+        self._apply(self._values(job), -1)
+
+    def update(self, old_map: Dict, new_map: Dict):
+        """Applies the difference between two dedup_key -> job maps."""
+        for key, job in old_map.items():
+            new = new_map.get(key)
+            if new is None:
+                self.remove(job)
+            elif new is not job:
+                old_values, new_values = self._values(job), self._values(new)
+                if old_values != new_values:
+                    self._apply(old_values, -1)
+                    self._apply(new_values, 1)
+        for key, job in new_map.items():
+            if key not in old_map:
+                self.add(job)
+
+    def reset(self, jobs: List):
+        self._tabs = {}
+        for job in jobs:
+            self.add(job)
+
+    def stats(self, category: str = None, source: str = None, k: int = 50) -> Dict:
+        """
+        Same shape as compute_analytics, plus per-source and per-category counts.
+        `category` and `source` match case-insensitively.
+        """
+        counts = self._tabs.get((category.lower() if category else None, source.lower() if source else None))
+        if counts is None:
+            counts = _Counts()
+        result = {"total_jobs": counts.total}
+        for name, _ in _DIMENSIONS:
+            result[name] = counts.dims[name].top(k)
+        return result
@@ -1,16 +1,19 @@
 from app.utils import async_get_json, logger
 from app.config import settings
-from typing import List, Any, Optional
+from app.cache import LRUCache
+from app.singleflight import SingleFlight
+from typing import List, Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+import asyncio
 
 class JobAPIClients:
     @staticmethod
-    async def fetch_arbeitnow() -> List[Any]:
+    async def fetch_arbeitnow(page: int = 1) -> List[Any]:
         """
-        ArbeitNow - Free remote job API, no key required.
+        ArbeitNow - Free remote job API, no key required. Paginated (`page`).
         Docs: https://arbeitnow.com/api
         """
         url = "https://www.arbeitnow.com/api/job-board-api"
-        data = await async_get_json(url)
+        data = await async_get_json(url, params={"page": page}, raise_errors=True)
 
         if settings.DEBUG_MODE and data:
             logger.debug(f"ArbeitNow raw data sample: {data.get('data', [])[:1] if isinstance(data, dict) else []}")
@@ -27,9 +30,10 @@ class JobAPIClients:
         """
         url = "https://jobicy.com/api/v2/remote-jobs"
         # Fixed: Remove 'geo' parameter that's causing 400 error
-        params = {"count": 50}
+        # No pagination upstream; 100 is the documented maximum count.
+        params = {"count": 100}
 
-        data = await async_get_json(url, params=params)
+        data = await async_get_json(url, params=params, raise_errors=True)
 
         if settings.DEBUG_MODE and data:
             logger.debug(f"Jobicy raw data sample: {data[:1] if isinstance(data, list) else []}")
@@ -47,9 +51,9 @@ class JobAPIClients:
         Docs: https://remotive.com/api
         """
         url = "https://remotive.com/api/remote-jobs"
-        params = {"limit": 50}
 
-        data = await async_get_json(url, params=params)
+        # No pagination upstream; without `limit` the full list is returned.
+        data = await async_get_json(url, raise_errors=True)
 
         if settings.DEBUG_MODE and data:
             logger.debug(f"Remotive raw data sample: {data.get('jobs', [])[:1] if isinstance(data, dict) else []}")
@@ -61,12 +65,9 @@ class JobAPIClients:
     @staticmethod
     async def fetch_adzuna() -> List[Any]:
         """
-        Adzuna API - Currently disabled due to 404 errors
-        """
-        logger.warning("Adzuna API temporarily disabled due to endpoint issues")
-        return []
-        
-        # Uncomment and fix when you have valid credentials:
+        Adzuna API. Has returned 404s; the source's circuit breaker skips it
+        while it keeps failing instead of it being disabled here.
+        Requires: ADZUNA_APP_ID, ADZUNA_APP_KEY
         """
         app_id = settings.ADZUNA_APP_ID
         app_key = settings.ADZUNA_APP_KEY
@@ -84,17 +85,16 @@ class JobAPIClients:
             "what": "software developer remote",
         }
 
-        data = await async_get_json(url, params=params)
-        
+        data = await async_get_json(url, params=params, raise_errors=True)
+
         if isinstance(data, dict):
             return data.get("results", [])
         return []
-        """
 
     @staticmethod
-    async def fetch_jooble() -> List[Any]:
+    async def fetch_jooble(page: int = 1) -> List[Any]:
         """
-        Jooble - Job search API.
+        Jooble - Job search API. Paginated (`page` in the POST body).
         Docs: https://jooble.org/api/about
         Requires: JOOBLE_KEY
         """
@@ -107,13 +107,15 @@ class JobAPIClients:
 
         payload = {
             "keywords": "software developer remote",
-            "location": "Saudi Arabia"
+            "location": "Saudi Arabia",
+            "page": str(page)
         }
 
         data = await async_get_json(
             url,
             method='POST',
-            json=payload
+            json=payload,
+            raise_errors=True
         )
 
         if settings.DEBUG_MODE and data:
@@ -129,13 +131,9 @@ class JobAPIClients:
         Careerjet - Job search API.
         Docs: https://www.careerjet.com/partners/api/
         Requires: CAREERJET_KEY
-        
-        Note: Temporarily disabled due to connection failures (likely rate limiting)
-        """
-        logger.info("Careerjet API temporarily disabled due to connection issues. Skipping fetch.")
-        return []
-        
-        # Uncomment below to re-enable once issues are resolved
+
+        Has failed with connection errors (likely rate limiting); the source's
+        circuit breaker backs off while that lasts.
         """
         key = settings.CAREERJET_KEY
         if not key:
@@ -154,7 +152,7 @@ class JobAPIClients:
             "page": 1
         }
 
-        data = await async_get_json(url, params=params)
+        data = await async_get_json(url, params=params, raise_errors=True)
 
         if settings.DEBUG_MODE and data:
             logger.debug(f"Careerjet raw data sample: {data.get('jobs', [])[:1] if isinstance(data, dict) else []}")
@@ -162,7 +160,6 @@ class JobAPIClients:
         if isinstance(data, dict):
             return data.get("jobs", [])
         return []
-        """
 
     @staticmethod
     async def fetch_openweb_ninja() -> List[Any]:
@@ -174,12 +171,74 @@ class JobAPIClients:
         return []
 
 
-async def fetch_ai_search_results(query: str) -> Optional[Any]:
+async def single_page(fetch: Callable[[], Awaitable[List[Any]]]) -> AsyncIterator[List[Any]]:
+    """Adapts a non-paginated client to the page-iterator interface."""
+    yield await fetch()
+
+
+async def walk_pages(
+    fetch_page: Callable[[int], Awaitable[List[Any]]],
+    max_pages: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[List[Any]]:
+    """
+    Walks a paginated upstream, yielding its pages in page order.
+
+    Page 1 is fetched first to learn the page size; pages 2..max_pages are then
+    fetched concurrently, in a window of `concurrency` pages (in flight, or
+    arrived early and waiting for an earlier page). Yielding in page order
+    keeps the snapshot order, and so which near-duplicate stays canonical,
+    independent of upstream latency. A short or empty page marks the end; the
+    pages after it are cancelled. A failure on any page propagates and cancels
+    the rest: ending the walk early would cache a truncated source as a
+    successful load.
+    """
+    max_pages = max_pages or settings.MAX_PAGES
+    concurrency = concurrency or settings.SOURCE_PAGE_CONCURRENCY
+
+    first = await fetch_page(1)
+    if not first:
+        return
+    yield first
+    page_size = len(first)
+
+    next_page = 2
+    # page number -> fetch, for the window of pages not yielded yet
+    pending: Dict[int, asyncio.Future] = {}
+
+    def launch_more():
+        nonlocal next_page
+        while next_page <= max_pages and len(pending) < concurrency:
+            pending[next_page] = asyncio.ensure_future(fetch_page(next_page))
+            next_page += 1
+
+    launch_more()
+    try:
+        page = 2
+        while page in pending:
+            items = await pending.pop(page)
+            if items:
+                yield items
+            if len(items) < page_size:
+                break
+            page += 1
+            launch_more()
+    finally:
+        # Past the end, consumer stopped early, or we failed: do not leave requests running.
+        for task in pending.values():
+            if task.done() and not task.cancelled():
+                task.exception()  # e.g. a 404 past the last page: expected, not worth a log line
+            task.cancel()
+
+
+async def fetch_ai_search_results(query: str, candidates: Optional[List[Dict]] = None) -> Optional[Any]:
     """
     Calls the external AI microservice to get intelligent search results.
 
     Args:
         query: The user's search query.
+        candidates: Pre-ranked jobs the AI service should choose from, instead
+            of scoring the whole corpus.
 
     Returns:
         The JSON response from the AI service, or None if the service is
@@ -192,6 +251,8 @@ async def fetch_ai_search_results(query: str) -> Optional[Any]:
     logger.debug(f"Calling AI service with query: '{query}'")
     try:
         payload = {"query": query}
+        if candidates is not None:
+            payload["candidates"] = candidates
         ai_results = await async_get_json(
             f"{settings.AI_SERVICE_URL}/search",
             method='POST',
@@ -208,4 +269,43 @@ async def fetch_ai_search_results(query: str) -> Optional[Any]:
 
     except Exception as e:
         logger.error(f"An unexpected error occurred while calling the AI service: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+# AI answers per (normalized query, snapshot version): a new snapshot naturally
+# invalidates them, the TTL bounds how long the AI service's own changes take
+# to show. Failures are not cached, so the next request tries again.
+ai_search_cache = LRUCache(settings.AI_CACHE_SIZE, ttl=settings.AI_CACHE_TTL_SECONDS)
+ai_search_flight = SingleFlight("ai_search")
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and token order do not change the answer: 'Riyadh  React' -> 'react riyadh'."""
+    return " ".join(sorted(query.lower().split()))
+
+
+async def cached_ai_search_results(
+    query: str,
+    snapshot_version: int,
+    candidates: Optional[Callable[[str], List[Dict]]] = None,
+) -> Optional[Any]:
+    """
+    fetch_ai_search_results behind an LRU + TTL cache. Concurrent identical
+    queries share one in-flight call to the AI service. `candidates` builds the
+    pre-ranked job list for the normalized query; it only runs on a miss.
+
+    Only the cache key is normalized: the AI service gets the query as the user
+    typed it (word order and casing can carry meaning for a language model).
+    """
+    key = (normalize_query(query), snapshot_version)
+    cached = ai_search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async def load():
+        results = await fetch_ai_search_results(query, candidates(key[0]) if candidates else None)
+        if results:
+            ai_search_cache.set(key, results)
+        return results
+
+    return await ai_search_flight.do(key, load)
\ No newline at end of file
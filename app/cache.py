@@ -0,0 +1,143 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.singleflight import SingleFlight
+from app.utils import logger
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at")
+
+    def __init__(self, value: Any, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate cache keyed by source name.
+
+    - age < ttl:        served from cache.
+    - age < max_stale:  stale value served immediately, refresh runs in the background.
+    - otherwise / miss: caller waits for a load.
+
+    A failed refresh keeps the last good value until it ages past max_stale.
+    Loads for the same key are coalesced, so a foreground miss and a background
+    refresh never hit the upstream twice.
+    """
+
+    def __init__(
+        self,
+        ttl_for: Callable[[str], float],
+        max_stale: float,
+        on_refresh: Optional[Callable[[str], None]] = None,
+    ):
+        self._ttl_for = ttl_for
+        self._max_stale = max_stale
+        self._on_refresh = on_refresh
+        self._entries: Dict[str, _Entry] = {}
+        self._flight = SingleFlight("swr_cache")
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_failures = 0
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self._entries[key] = _Entry(value, time.monotonic())
+        return value
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        try:
+            await self._flight.do(key, lambda: self._load(key, loader))
+        except Exception as e:
+            self.refresh_failures += 1
+            logger.warning(f"swr_cache: background refresh for {key} failed, keeping stale data: {e}")
+            return
+        finally:
+            self._refreshing.pop(key, None)
+        if self._on_refresh is not None:
+            self._on_refresh(key)
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age < self._ttl_for(key):
+                self.hits += 1
+                return entry.value
+            if age < self._max_stale:
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    # Keeping the task referenced also stops it being garbage collected mid-flight.
+                    self._refreshing[key] = asyncio.create_task(self._refresh(key, loader))
+                return entry.value
+            # Too old to serve: drop it so a failed reload does not resurrect it.
+            del self._entries[key]
+
+        self.misses += 1
+        return await self._flight.do(key, lambda: self._load(key, loader))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refresh_failures": self.refresh_failures,
+            "age_seconds": {k: round(now - e.fetched_at, 1) for k, e in self._entries.items()},
+        }
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with optional per-entry TTL.
+
+    Synchronous and lock-free: it is only touched from the event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.evictions += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self._ttl if self._ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": self._maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
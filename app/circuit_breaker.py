@@ -0,0 +1,131 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app.config import settings
+from app.utils import logger
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose breaker is open."""
+
+
+def _describe(error: Exception) -> str:
+    """
+    Exception class names along the cause chain, plus the HTTP status if any,
+    e.g. 'UpstreamError <- HTTPStatusError (503)'. Messages are left out: they
+    carry upstream URLs, API keys included, and stats() is served by /health.
+    """
+    names = []
+    status = None
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        names.append(type(current).__name__)
+        status = status or getattr(getattr(current, "response", None), "status_code", None)
+        current = current.__cause__ or current.__context__
+    description = " <- ".join(names)
+    return f"{description} ({status})" if status else description
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one upstream source.
+
+    Closed: calls go through; the last `window` outcomes are kept. Once at least
+    `min_calls` are recorded and the failure rate reaches `failure_rate`, it
+    opens. Open: calls fail instantly with CircuitOpenError for `open_seconds`.
+    Half-open: the next call is let through as a probe; success closes the
+    breaker with a clean window, failure opens it for another period.
+    """
+
+    def __init__(self, name: str, window: int, min_calls: int, failure_rate: float, open_seconds: float):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self.last_error: Optional[str] = None
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+            logger.info(f"circuit {self.name}: half-open, probing")
+        if self.state == OPEN:
+            self.rejected += 1
+            return False
+        return True
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        logger.warning(f"circuit {self.name}: open for {self.open_seconds:.0f}s ({self.last_error})")
+
+    def record_success(self, seconds: float):
+        self._latencies.append(seconds)
+        if self.state == HALF_OPEN:
+            self._outcomes.clear()
+            logger.info(f"circuit {self.name}: closed")
+        self.state = CLOSED
+        self._outcomes.append(True)
+
+    def record_failure(self, seconds: float, error: Exception):
+        self._latencies.append(seconds)
+        self.last_error = _describe(error)
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def stats(self) -> Dict[str, Any]:
+        outcomes = len(self._outcomes)
+        result = {
+            "state": self.state,
+            "failure_rate": round(self._outcomes.count(False) / outcomes, 2) if outcomes else 0.0,
+            "calls": outcomes,
+            "rejected": self.rejected,
+            "last_latency_ms": round(self._latencies[-1] * 1000, 1) if self._latencies else None,
+            "avg_latency_ms": round(sum(self._latencies) / len(self._latencies) * 1000, 1) if self._latencies else None,
+            "last_error": self.last_error,
+        }
+        if self.state == OPEN:
+            result["retry_in_seconds"] = round(max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1)
+        return result
+
+
+class SourceBreakers:
+    """One CircuitBreaker per source name, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(
+                name,
+                window=settings.CIRCUIT_WINDOW,
+                min_calls=settings.CIRCUIT_MIN_CALLS,
+                failure_rate=settings.CIRCUIT_FAILURE_RATE,
+                open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            )
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: b.stats() for name, b in self._breakers.items()}
+
+
+source_breakers = SourceBreakers()
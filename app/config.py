@@ -1,20 +1,67 @@
-from typing import Optional
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     APP_PORT: int = 7070
-    DATABASE_URL: Optional[str] = None
+    DATABASE_URL: Optional[str] = "sqlite:///ksa_jobs.db"  # set empty to disable persistence
     LOG_LEVEL: str = "ERROR"  
     MAX_RETRIES: int = 3
+    RETRY_BASE_DELAY: float = 0.5  # decorrelated jitter: sleep = uniform(base, previous * 3)
+    RETRY_MAX_DELAY: float = 8.0
+    RETRY_AFTER_MAX_SECONDS: float = 60.0  # a longer upstream Retry-After gives up instead of waiting
+    NEAR_DEDUP_ENABLED: bool = True  # fold cross-source reposts of the same role (MinHash/LSH)
+    HTTP_CACHE_ENABLED: bool = True  # conditional GETs (ETag / Last-Modified) against upstream APIs
+    INGEST_DEADLINE_SECONDS: float = 45.0  # whole fetch_all_jobs fan-out, retries included
+    # Where JSON parsing and filter/normalize run during ingest: inline (event loop), thread or process
+    INGEST_EXECUTOR: str = "thread"
+    INGEST_EXECUTOR_WORKERS: int = 2
+    INGEST_CHUNK_SIZE: int = 500  # items per filter/normalize batch handed to the executor
+    OFFLOAD_PARSE_MIN_BYTES: int = 262144  # smaller payloads are parsed on the event loop
+    # Ingest pipeline: pages (or source batches) waiting per stage before the stage upstream blocks
+    INGEST_QUEUE_SIZE: int = 4
+    INGEST_NORMALIZE_WORKERS: int = 2  # pages of one source normalized concurrently
+    # Per-source circuit breaker: opens once CIRCUIT_FAILURE_RATE of the last CIRCUIT_WINDOW
+    # loads failed (with at least CIRCUIT_MIN_CALLS recorded), probes again after CIRCUIT_OPEN_SECONDS.
+    CIRCUIT_WINDOW: int = 10
+    CIRCUIT_MIN_CALLS: int = 2
+    CIRCUIT_FAILURE_RATE: float = 0.5
+    CIRCUIT_OPEN_SECONDS: float = 600.0
     TIMEOUT: int = 15
+    # Outbound HTTP pool. HTTP2_ENABLED needs the optional `h2` package (pip install httpx[http2]).
+    HTTP_MAX_CONNECTIONS: int = 50
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 6  # a slow host cannot hold more than this many
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_MIN_READ_TIMEOUT: float = 3.0  # adaptive read timeout = clamp(p95 * factor, min, TIMEOUT)
+    HTTP_TIMEOUT_P95_FACTOR: float = 3.0
+    HTTP_LATENCY_WINDOW: int = 100  # recent responses per host used for the p95
     PAGE_SIZE: int = 20
+    MAX_PAGES: int = 10  # upstream pages walked per paginated source per ingest
+    SOURCE_PAGE_CONCURRENCY: int = 3  # page requests in flight per source
+    # Per-source freshness (seconds) for the stale-while-revalidate source cache
+    SOURCE_TTL_SECONDS: Dict[str, int] = {"arbeitnow": 1800, "jobicy": 3600, "remotive": 3600, "jooble": 7200}
+    DEFAULT_SOURCE_TTL_SECONDS: int = 3600
+    SOURCE_MAX_STALE_SECONDS: int = 86400  # hard limit: older data is never served
+    RESPONSE_CACHE_SIZE: int = 256  # pre-serialized /jobs/ pages kept per snapshot
+    CHANGE_LOG_VERSIONS: int = 168  # snapshot versions /jobs/changes can diff against (~1 week hourly)
+    # Multi-worker mode (uvicorn --workers N): the process holding INGEST_LOCK_PATH runs the
+    # ingest and writes SHARED_SNAPSHOT_PATH; the other workers only read it.
+    SHARED_SNAPSHOT_PATH: Optional[str] = None
+    INGEST_LOCK_PATH: str = "ksa_jobs.ingest.lock"
+    SHARED_SNAPSHOT_POLL_SECONDS: float = 2.0
     ADZUNA_APP_ID: str = "34b57806"
     ADZUNA_APP_KEY: str = "a4a65342386e18a41d55e203520809ad"
     JOOBLE_KEY: str = "bcf720ac-ffc5-429e-ae29-797dedf6ee44"
     CAREERJET_KEY: str = "6fde6cdcf3154cacfe7c6fe002c3c86c"
     OPENWEBNINJA_KEY: str = "ak_q7f0dwbhl7k7txtot1sp5ltun9lr7rwlgz2070mx1l3b53w"
     DEBUG_MODE: bool =   False
+    AI_CACHE_SIZE: int = 512  # cached AI search answers (normalized query + snapshot version)
+    AI_CACHE_TTL_SECONDS: float = 900.0
+    AI_CANDIDATES: int = 300  # BM25 pre-ranked jobs sent along with each AI query (0: none)
+    RANKED_TOP_K: int = 500  # ranked /jobs/?query= results served without the AI service
     AI_SERVICE_URL: Optional[str] = None  # TODO: Replace with the internal K8s DNS name for the AI microservice
 
     class Config:
@@ -22,4 +69,13 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
+
+
+def sqlite_path(database_url: str) -> str:
+    """Accepts `sqlite:///relative.db`, `sqlite:////abs/path.db` or a bare path."""
+    if database_url.startswith("sqlite:///"):
+        return database_url[len("sqlite:///"):]
+    if "://" in database_url:
+        raise ValueError(f"Unsupported DATABASE_URL (only sqlite is supported): {database_url}")
+    return database_url
\ No newline at end of file
@@ -1,5 +1,5 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from app.job_service import fetch_all_jobs
+from app.job_service import refresh_job_store
 from app.utils import logger
 import asyncio
 
@@ -14,16 +14,18 @@ def start_scheduler():
     # schedule periodic job; we run it as fire-and-forget
     async def runner():
         try:
-            await fetch_all_jobs()
+            await refresh_job_store()
         except Exception as e:
-            logger.exception("cron initial run failed: %s", str(e))
+            logger.exception("cron ingest run failed: %s", str(e))
 
     initial_task = asyncio.create_task(runner())
     initial_task.add_done_callback(log_task_exception)
 
     # schedule hourly
-    hourly_task = scheduler.add_job(lambda: asyncio.create_task(fetch_all_jobs()), 'interval', hours=1, id="ingest_hourly")
+    hourly_task = scheduler.add_job(lambda: asyncio.create_task(runner()), 'interval', hours=1, id="ingest_hourly")
     # For scheduled jobs, APScheduler handles errors internally, but we can still ensure visibility
     # APScheduler's default error handling will log, but this ensures consistency with our custom logger
     # Note: APScheduler tasks are generally robust, this primarily for direct asyncio.create_task usage.
+    if not scheduler.running:
+        scheduler.start()
     logger.info("scheduler started (hourly ingestion)")
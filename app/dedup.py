@@ -0,0 +1,211 @@
+import re
+import string
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.models import Job
+
+
+# One-permutation MinHash: each shingle is hashed once and the hash picks a
+# bin (low bits) and a value (high bits); the signature keeps the minimum
+# value per bin. Hashes are stable across processes, so clusters do not
+# shift between runs. One hash per shingle instead of one per permutation
+# keeps 100k+ jobs per run affordable in pure Python.
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS  # LSH candidate threshold ~ (1 / BANDS) ** (1 / ROWS) = 0.5
+_BIN_BITS = NUM_BINS.bit_length() - 1
+_BIN_MASK = NUM_BINS - 1
+_EMPTY = 0xFFFFFFFF
+
+# Jobs are merged when their estimated shingle Jaccard reaches SIMILARITY and
+# their normalized titles share TITLE_SIMILARITY of their tokens, so two roles
+# posted with the same boilerplate description stay apart.
+SIMILARITY = 0.8
+TITLE_SIMILARITY = 0.75
+DESCRIPTION_TOKENS = 80  # leading description words used for shingles
+# Jobs with less description than this are left to the exact dedup: a bare
+# title match at one company is as likely a second opening as a repost.
+MIN_DESCRIPTION_TOKENS = 20
+MAX_BUCKET_CHECKS = 20  # pairs verified per LSH bucket, bounds degenerate buckets
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Descriptions are tokenized with translate + split: several times faster than
+# the regex on long text, and only the leading DESCRIPTION_TOKENS words are used.
+_PUNCTUATION_TO_SPACE = str.maketrans({c: " " for c in string.punctuation})
+_DESCRIPTION_CHARS = DESCRIPTION_TOKENS * 12
+_TITLE_NOISE = frozenset({
+    "m", "f", "w", "d", "x", "remote", "hybrid", "onsite", "full", "time", "fulltime",
+    "part", "parttime", "contract", "job", "position", "role", "hiring", "urgent",
+})
+_TITLE_ALIASES = {
+    "sr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer",
+    "dev": "developer", "mgr": "manager", "swe": "software engineer",
+}
+_COMPANY_SUFFIXES = frozenset({
+    "inc", "llc", "ltd", "limited", "gmbh", "co", "corp", "corporation", "company", "plc", "ag", "bv", "the",
+})
+
+
+def normalize_title(title: str) -> str:
+    """'Sr. Backend Dev (m/w/d) - Remote' -> 'senior backend developer'."""
+    tokens = []
+    for token in _TOKEN.findall((title or "").lower()):
+        if token in _TITLE_NOISE:
+            continue
+        tokens.append(_TITLE_ALIASES.get(token, token))
+    return " ".join(tokens)
+
+
+def normalize_company(company: str) -> str:
+    """'Acme, Inc.' -> 'acme'."""
+    return " ".join(t for t in _TOKEN.findall((company or "").lower()) if t not in _COMPANY_SUFFIXES)
+
+
+def _signature(title: str, description: str) -> Optional[array]:
+    text = _HTML_TAG.sub(" ", description[:_DESCRIPTION_CHARS * 2])[:_DESCRIPTION_CHARS]
+    words = text.lower().translate(_PUNCTUATION_TO_SPACE).split()[:DESCRIPTION_TOKENS]
+    if len(words) < MIN_DESCRIPTION_TOKENS:
+        return None
+    # Shingles: title tokens plus description word bigrams. A bigram is hashed
+    # as the tuple of its two word hashes (int tuple hashing is not salted per
+    # process, unlike str hashing) rather than as a joined string.
+    word_hashes = [zlib.crc32(word.encode()) for word in words]
+    hashes = {zlib.crc32(token.encode()) for token in title.split()}
+    hashes.update(hash(pair) & 0xFFFFFFFF for pair in zip(word_hashes, word_hashes[1:]))
+    # Within a bin, hash order is value order, so the last write of a
+    # descending pass leaves each bin's minimum.
+    mins = {h & _BIN_MASK: h >> _BIN_BITS for h in sorted(hashes, reverse=True)}
+    return array("I", [mins.get(b, _EMPTY) for b in range(NUM_BINS)])
+
+
+# id(job) -> (job, signature) from the last run. Jobs carried over unchanged by
+# the incremental ingest are the same objects, so their signatures are reused.
+_signature_memo: Dict[int, Tuple[Job, Optional[array]]] = {}
+
+
+def _similarity(a: array, b: array) -> float:
+    """Estimated Jaccard: share of equal bins among bins filled in both."""
+    filled = equal = 0
+    for x, y in zip(a, b):
+        if x != _EMPTY and y != _EMPTY:
+            filled += 1
+            equal += x == y
+    return equal / filled if filled else 0.0
+
+
+def _title_similarity(a: str, b: str) -> float:
+    """Token Jaccard of two normalized titles."""
+    if a == b:
+        return 1.0
+    a_tokens, b_tokens = set(a.split()), set(b.split())
+    if not a_tokens or not b_tokens:
+        return 0.0
+    return len(a_tokens & b_tokens) / len(a_tokens | b_tokens)
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate clusters over a growing job list.
+
+    Candidates come from LSH banding over MinHash signatures, bucketed per
+    normalized company, so the work grows with the number of jobs rather than
+    with the number of pairs. Buckets and clusters are kept between add()
+    calls: a batch is only checked against the jobs already indexed, never
+    re-clustered from scratch. The earliest job of a cluster is its root.
+    """
+
+    def __init__(self):
+        self.jobs: List[Job] = []
+        self._parent: List[int] = []
+        self._companies: List[str] = []
+        self._titles: List[str] = []
+        self.signatures: List[Optional[array]] = []
+        # One dict per band, keyed by company + band bytes. Keys are bytes and a
+        # bucket is a bare int until a second job lands in it: 100k jobs x BANDS
+        # entries of tuples and lists would mostly be cyclic-GC overhead.
+        self._buckets: List[Dict[bytes, Union[int, List[int]]]] = [{} for _ in range(BANDS)]
+
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def is_root(self, i: int) -> bool:
+        return self._find(i) == i
+
+    def add(self, jobs: List[Job]) -> List[int]:
+        """
+        Indexes `jobs` after the ones already added. Returns the positions of
+        jobs that stopped being a cluster root (folded into an earlier job).
+        """
+        start = len(self.jobs)
+        memo = _signature_memo
+        for job in jobs:
+            title = normalize_title(job.title)
+            self._companies.append(normalize_company(job.company))
+            self._titles.append(title)
+            hit = memo.get(id(job))
+            self.signatures.append(
+                hit[1] if hit is not None and hit[0] is job else _signature(title, job.description or "")
+            )
+        self.jobs.extend(jobs)
+        self._parent.extend(range(start, len(self.jobs)))
+
+        find, parent = self._find, self._parent
+        titles, signatures, buckets = self._titles, self.signatures, self._buckets
+        folded: List[int] = []
+        width = ROWS * array("I").itemsize
+        for i in range(start, len(self.jobs)):
+            signature = signatures[i]
+            if signature is None:
+                continue
+            sig = signature.tobytes()
+            company = self._companies[i].encode() + b"\x00"
+            for band in range(BANDS):
+                key = company + sig[band * width:(band + 1) * width]
+                members = buckets[band].get(key)
+                if members is None:
+                    buckets[band][key] = i
+                    continue
+                if type(members) is int:
+                    members = buckets[band][key] = [members]
+                root_i = find(i)
+                for j in members[:MAX_BUCKET_CHECKS]:
+                    root_j = find(j)
+                    if root_i == root_j:
+                        break
+                    if (_title_similarity(titles[i], titles[j]) >= TITLE_SIMILARITY
+                            and _similarity(signature, signatures[j]) >= SIMILARITY):
+                        # The earlier job stays the root, i.e. the canonical record
+                        if root_j < root_i:
+                            parent[root_i] = root_j
+                            folded.append(root_i)
+                        else:
+                            parent[root_j] = root_i
+                            folded.append(root_j)
+                        break
+                members.append(i)
+        return folded
+
+
+def collapse_near_duplicates(jobs: List[Job]) -> Tuple[List[Job], int]:
+    """
+    Clusters near-duplicate postings (same company after normalization,
+    near-identical title and description) and keeps one job per cluster.
+
+    The earliest job of a cluster is kept, so its dedup_key stays the
+    cluster's canonical ID. Returns (kept jobs in their original order,
+    number of jobs folded into another).
+    """
+    global _signature_memo
+    index = NearDuplicateIndex()
+    index.add(jobs)
+    _signature_memo = {id(job): (job, signature) for job, signature in zip(jobs, index.signatures)}
+
+    kept = [job for i, job in enumerate(jobs) if index.is_root(i)]
+    return kept, len(jobs) - len(kept)
@@ -1,5 +1,4 @@
 import re
-from typing import List
 
 from app.utils import logger
 
@@ -37,6 +36,26 @@ REMOTE_KEYWORDS = (
     re.compile(r"\b100%\s*remote\b", re.IGNORECASE)
 )
 
+# Each keyword family above folded into one alternation, so a field is scanned
+# once per family instead of once per keyword. Used by the batch classifier.
+def _combine(patterns: tuple) -> re.Pattern:
+    return re.compile(
+        r"\b(?:" + "|".join(p.pattern[2:-2] for p in patterns) + r")\b",
+        re.IGNORECASE,
+    )
+
+
+KSA_OR_REGIONAL_PATTERN = _combine(KSA_LOCATION_KEYWORDS + REGIONAL_KEYWORDS)
+REMOTE_PATTERN = _combine(REMOTE_KEYWORDS)
+
+# Joins the fields scanned for remote keywords. NUL is neither \s nor \w, so
+# no keyword (or \s* inside one) can match across two fields. Not \x1f-\x1c:
+# Python's \s counts the ASCII separators as whitespace.
+_FIELD_SEPARATOR = "\x00"
+
+CATEGORY_REMOTE = "Remote"
+CATEGORY_ON_SITE_KSA = "On-site KSA"
+
 
 def _contains_keyword(text: str, keywords: tuple) -> bool:
     """
@@ -59,15 +78,8 @@ def _contains_keyword(text: str, keywords: tuple) -> bool:
         return False
 
 
-def _extract_job_text_fields(raw_job: dict) -> tuple[str, str, str, str, str]:
-    """Helper to safely extract and normalize job text fields."""
-    loc_raw = (
-        raw_job.get("location")
-        or raw_job.get("candidate_required_location")
-        or raw_job.get("jobGeo")
-        or raw_job.get("jobLocation")
-        or ""
-    )
+def _location_text(loc_raw) -> str:
+    """Flattens a raw location (string or provider-specific dict) to lowercase text."""
     if isinstance(loc_raw, dict):
         loc = (
             loc_raw.get("display_name") or loc_raw.get("name") or loc_raw.get("city") or ""
@@ -80,7 +92,18 @@ def _extract_job_text_fields(raw_job: dict) -> tuple[str, str, str, str, str]:
             loc = loc_raw.get("country", "")
     else:
         loc = str(loc_raw)
-    loc = loc.lower().strip()
+    return loc.lower().strip()
+
+
+def _extract_job_text_fields(raw_job: dict) -> tuple[str, str, str, str, str]:
+    """Helper to safely extract and normalize job text fields."""
+    loc = _location_text(
+        raw_job.get("location")
+        or raw_job.get("candidate_required_location")
+        or raw_job.get("jobGeo")
+        or raw_job.get("jobLocation")
+        or ""
+    )
 
     job_type = str(
         raw_job.get("jobType")
@@ -158,6 +181,32 @@ def is_truly_remote_job(raw_job: dict) -> bool:
     return is_explicitly_remote
 
 
+def classify_job(raw_job: dict) -> str:
+    """
+    Single-pass equivalent of is_truly_remote_job / is_ksa_on_site_job.
+
+    Returns "Remote", "On-site KSA", or "" when the job is neither (i.e. when
+    filter_ksa_remote would reject it).
+    """
+    loc, job_type, title, _, description = _extract_job_text_fields(raw_job)
+    return classify_fields(raw_job.get("remote"), loc, job_type, title, description)
+
+
+def classify_fields(remote_flag, loc: str, job_type: str, title: str, description: str) -> str:
+    """
+    Classifies already-extracted, lowercased fields (as returned by
+    _extract_job_text_fields). Shared by classify_job and the fused
+    filter/normalize stage, which extracts fields itself.
+    """
+    if remote_flag is True or str(remote_flag).lower() == "true":
+        return CATEGORY_REMOTE
+    if REMOTE_PATTERN.search(_FIELD_SEPARATOR.join((loc, job_type, title, description))):
+        return CATEGORY_REMOTE
+    if loc and KSA_OR_REGIONAL_PATTERN.search(loc):
+        return CATEGORY_ON_SITE_KSA
+    return ""
+
+
 def filter_ksa_remote(raw_job: dict) -> bool:
     """
     Filter to show jobs that Saudi residents can apply to:
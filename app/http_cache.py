@@ -0,0 +1,179 @@
+import asyncio
+import contextvars
+import hashlib
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import httpx
+import orjson
+
+from app.config import settings, sqlite_path
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    key           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    body          BLOB NOT NULL,
+    stored_at     REAL NOT NULL
+)
+"""
+
+_UPSERT = """
+INSERT INTO http_cache (key, etag, last_modified, body, stored_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    etag = excluded.etag, last_modified = excluded.last_modified,
+    body = excluded.body, stored_at = excluded.stored_at
+"""
+
+
+class RequestTrace:
+    """What the conditional requests made while loading one source came back with."""
+    __slots__ = ("source", "not_modified", "modified", "cacheable")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.not_modified = 0
+        self.modified = 0
+        self.cacheable = False
+
+
+# Set by job_service around a source load; async_get_json tasks inherit it.
+_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("http_cache_trace", default=None)
+
+
+@contextmanager
+def trace_requests(source: str):
+    token = _trace.set(RequestTrace(source))
+    try:
+        yield _trace.get()
+    finally:
+        _trace.reset(token)
+
+
+class _Cached:
+    """
+    One cached response. Only one form of the body is held in memory: the raw
+    bytes until they are decoded (or written to SQLite), then just the value.
+    """
+    __slots__ = ("etag", "last_modified", "body", "value")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], body: Optional[bytes], value: Any = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.value = value  # decoded body, parsed at most once per process
+
+
+class HTTPCache:
+    """
+    Validators (ETag / Last-Modified) and bodies of upstream JSON responses,
+    keyed by method + URL + params + JSON body.
+
+    A 304 returns the very object decoded from the original 200, so callers
+    can recognise an unchanged page by identity and skip reprocessing it.
+    Entries are kept in memory and, when DATABASE_URL is set, in SQLite so a
+    restart can still revalidate instead of downloading everything again.
+    Blocking sqlite calls run in a worker thread.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._entries: Dict[str, Optional[_Cached]] = {}
+        self._initialized = False
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[dict], json: Optional[dict]) -> str:
+        raw = orjson.dumps([method.upper(), url, params, json], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        if not self._initialized:
+            conn.execute(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    def _read(self, key: str) -> Optional[_Cached]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT etag, last_modified, body FROM http_cache WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _Cached(*row) if row else None
+
+    def _write(self, key: str, entry: _Cached):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(_UPSERT, (key, entry.etag, entry.last_modified, entry.body, time.time()))
+        finally:
+            conn.close()
+
+    async def lookup(self, key: str) -> Optional[_Cached]:
+        if key not in self._entries:
+            self._entries[key] = await asyncio.to_thread(self._read, key) if self.path else None
+        return self._entries[key]
+
+    @staticmethod
+    def conditional_headers(entry: Optional[_Cached], headers: Optional[dict]) -> Optional[dict]:
+        if entry is None:
+            return headers
+        headers = dict(headers or {})
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def not_modified(self, entry: _Cached) -> Any:
+        """Answers a 304 from the cached body."""
+        trace = _trace.get()
+        self.hits[trace.source if trace else "other"] += 1
+        if trace is not None:
+            trace.not_modified += 1
+            trace.cacheable = True
+        if entry.value is None:
+            # Loaded from SQLite: decode once, then the bytes are only on disk.
+            entry.value = orjson.loads(entry.body)
+            entry.body = None
+        return entry.value
+
+    async def store(self, key: str, resp: httpx.Response, value: Any):
+        """Records a 200; keeps it only if upstream sent a validator."""
+        trace = _trace.get()
+        self.misses[trace.source if trace else "other"] += 1
+        if trace is not None:
+            trace.modified += 1
+        etag = resp.headers.get("etag")
+        last_modified = resp.headers.get("last-modified")
+        if not etag and not last_modified:
+            self._entries[key] = None
+            return
+        if trace is not None:
+            trace.cacheable = True
+        entry = _Cached(etag, last_modified, resp.content, value)
+        self._entries[key] = entry
+        if self.path:
+            await asyncio.to_thread(self._write, key, entry)
+        # A 304 is answered from the decoded value; the raw body was only kept
+        # for SQLite, and would double the memory of every cached page.
+        entry.body = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for source in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits[source], self.misses[source]
+            result[source] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3)}
+        return result
+
+
+http_cache = HTTPCache(sqlite_path(settings.DATABASE_URL) if settings.DATABASE_URL else None)
@@ -0,0 +1,108 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+
+from app.config import settings
+
+
+# Below this many samples a host gets the static TIMEOUT read budget.
+_MIN_SAMPLES = 5
+
+
+class HostBudget:
+    """
+    Per-host connection slots and latency history.
+
+    The semaphore caps how many pooled connections one host may hold, so a slow
+    host (e.g. Jooble) cannot starve the fast ones. Observed latencies drive the
+    adaptive read timeout.
+    """
+
+    def __init__(self, host: str, max_connections: int):
+        self.host = host
+        self._slots = asyncio.Semaphore(max_connections)
+        self.max_connections = max_connections
+        self.latencies: Deque[float] = deque(maxlen=settings.HTTP_LATENCY_WINDOW)
+        self.in_flight = 0
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._slots:
+            self.in_flight += 1
+            self.requests += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def observe(self, seconds: float):
+        self.latencies.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < _MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def timeout(self) -> httpx.Timeout:
+        """Separate connect and read budgets; read adapts to this host's p95."""
+        p95 = self.p95()
+        if p95 is None:
+            read = float(settings.TIMEOUT)
+        else:
+            read = min(float(settings.TIMEOUT), max(settings.HTTP_MIN_READ_TIMEOUT, p95 * settings.HTTP_TIMEOUT_P95_FACTOR))
+        return httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=read,
+            write=settings.HTTP_CONNECT_TIMEOUT,
+            pool=settings.HTTP_CONNECT_TIMEOUT,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "in_flight": self.in_flight,
+            "max_connections": self.max_connections,
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "read_timeout_s": round(self.timeout().read, 2),
+        }
+
+
+class HostPool:
+    """Registry of HostBudget objects, one per upstream host."""
+
+    def __init__(self):
+        self._hosts: Dict[str, HostBudget] = {}
+
+    def host(self, url: str) -> HostBudget:
+        host = httpx.URL(url).host
+        budget = self._hosts.get(host)
+        if budget is None:
+            budget = self._hosts[host] = HostBudget(host, settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+        return budget
+
+    def stats(self, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"hosts": {host: b.stats() for host, b in self._hosts.items()}}
+        # httpx does not expose pool state publicly; read it defensively.
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            result["pool"] = {
+                "connections": len(connections),
+                "idle": sum(1 for c in connections if c.is_idle()),
+                "max_connections": settings.HTTP_MAX_CONNECTIONS,
+                "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            }
+        return result
+
+
+host_pool = HostPool()
@@ -1,69 +1,470 @@
-from typing import List, Dict, Callable, Iterable
-from app.api_clients import JobAPIClients
-from app.filters import filter_ksa_remote
+from typing import List, Dict, Callable, AsyncIterator, Optional, Tuple
+from app.api_clients import JobAPIClients, single_page, walk_pages
 from app.utils import logger
-from app.normalizer import normalize_job
+from app.retry import deadline_budget
+from app.normalizer import content_hash, filter_and_normalize_item, filter_and_normalize_items
+from app.offload import INLINE, offloader
+from app.pipeline import Pipeline, Stage
+from app.models import Job
+from app.job_store import job_store, JobSnapshot
+from app.singleflight import SingleFlight
+from app.cache import SWRCache
+from app.circuit_breaker import CircuitOpenError, source_breakers
+from app.http_cache import trace_requests
+from app.dedup import NearDuplicateIndex, collapse_near_duplicates
+from app.config import settings
+from app.storage import job_storage
+from app.shared_snapshot import shared_snapshot
 import asyncio
 import hashlib
 import time # Added import for time module
 
-def _fingerprint(job: Dict) -> str:
-    txt = (job.get("title","") or "") + "|" + (job.get("company","") or "") + "|" + (job.get("url","") or "")
+# Concurrent fetch_all_jobs callers share one in-flight ingest instead of each
+# fanning out to every upstream API.
+ingest_flight = SingleFlight("fetch_all_jobs")
+
+
+def _source_ttl(src_name: str) -> float:
+    return settings.SOURCE_TTL_SECONDS.get(src_name, settings.DEFAULT_SOURCE_TTL_SECONDS)
+
+
+_background_tasks: set = set()
+
+
+def _is_follower() -> bool:
+    """Multi-worker mode, and this worker is not the ingest leader."""
+    return shared_snapshot is not None and not shared_snapshot.is_leader
+
+
+def _republish_after_refresh(src_name: str):
+    # A source finished a background refresh: rebuild the snapshot so the new data
+    # is served now rather than on the next cron tick. Every other source is
+    # answered from cache, so this costs no upstream calls.
+    if _is_follower():
+        # Only the leader publishes and persists; followers load its snapshot.
+        return
+    logger.info(f"source {src_name} refreshed in background, republishing snapshot")
+    # An ingest already in flight may have read this source before the refresh
+    # landed: joining it would republish the stale data. Let it settle first.
+    task = asyncio.create_task(_republish(ingest_flight.in_flight("fetch_all_jobs")))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _republish(running: Optional[asyncio.Future]):
+    if running is not None:
+        try:
+            await asyncio.shield(running)
+        except Exception:
+            pass  # its caller logs the failure; the new ingest below still runs
+    await refresh_job_store()
+
+
+source_cache = SWRCache(
+    ttl_for=_source_ttl,
+    max_stale=settings.SOURCE_MAX_STALE_SECONDS,
+    on_refresh=_republish_after_refresh,
+)
+
+def _fingerprint(job: Job) -> str:
+    txt = (job.title or "") + "|" + (job.company or "") + "|" + (job.url or "")
     # use SHA256 instead of SHA1
     return hashlib.sha256(txt.encode("utf-8")).hexdigest()
 
-async def _run_client(src_name: str, fn: Callable[[], Iterable[Dict]]) -> List[Dict]:
+PageSource = Callable[[], AsyncIterator[List[Dict]]]
+
+ItemMemo = Dict[bytes, Optional[Job]]
+
+# Per source: content_hash -> Job (None: filtered out) for every item of its
+# last load. Items whose hash is unchanged reuse their Job; only new or edited
+# items go through filter/normalize again.
+_item_memo: Dict[str, ItemMemo] = {}
+
+# Per source: the raw pages of its last load, by identity, with the jobs and
+# item hashes they produced. A page answered by an upstream 304 is the very
+# same object again, so it is reused without even hashing its items.
+_page_memo: Dict[str, Dict[int, Tuple[list, List[Job], ItemMemo]]] = {}
+
+# added / changed / removed job counts of the last ingest, against the snapshot it replaced
+last_ingest: Dict[str, int] = {}
+
+
+def _normalize_page(src_name: str, raw: List[Dict], previous: ItemMemo) -> Tuple[List[Job], ItemMemo, int]:
+    """Returns the page's jobs, its hash memo and how many items were reused unchanged."""
+    jobs: List[Job] = []
+    page_items: ItemMemo = {}
+    reused = 0
+    for item in raw:
+        digest = content_hash(item, src_name)
+        if digest is not None and digest in previous:
+            job = previous[digest]
+            reused += 1
+        else:
+            normalized = filter_and_normalize_item(item, src_name)
+            job = Job.from_dict(normalized) if normalized is not None else None
+        if digest is not None:
+            page_items[digest] = job
+        if job is not None:
+            jobs.append(job)
+    return jobs, page_items, reused
+
+async def _normalize_page_offloaded(src_name: str, raw: List[Dict], previous: ItemMemo) -> Tuple[List[Job], ItemMemo, int]:
+    """
+    _normalize_page with filter/normalize handed to the ingest executor in
+    INGEST_CHUNK_SIZE batches, spread over its workers. Only hashing and memo
+    lookups stay on the event loop, which is yielded between chunks.
+    """
+    size = max(1, settings.INGEST_CHUNK_SIZE)
+    chunks = []
+    for start in range(0, len(raw), size):
+        chunk = raw[start:start + size]
+        digests = [content_hash(item, src_name) for item in chunk]
+        misses = [item for item, digest in zip(chunk, digests) if digest is None or digest not in previous]
+        task = asyncio.ensure_future(offloader.run(filter_and_normalize_items, misses, src_name)) if misses else None
+        chunks.append((digests, task))
+        await asyncio.sleep(0)
+
+    jobs: List[Job] = []
+    page_items: ItemMemo = {}
+    reused = 0
     try:
-        start_time = time.monotonic() # Start timing
-        raw = await fn()
-        duration = (time.monotonic() - start_time) * 1000 # Calculate duration in ms
-        logger.info(f"client {src_name} fetch completed in {duration:.2f} ms") # Log duration
-
-        if not isinstance(raw, list):
-            logger.warning(f"client {src_name} returned non-list; ignoring")
-            return []
-        kept = []
-        for item in raw:
-            try:
-                if filter_ksa_remote(item):
-                    kept.append(normalize_job(item, src_name))
-            except Exception as e:
-                logger.exception(f"Normalization error for {src_name} item: {e}")
-        logger.info(f"client {src_name} processed {len(raw)} raw jobs, {len(kept)} jobs kept after filtering and normalization.")
-        return kept
+        for digests, task in chunks:
+            normalized = iter(await task) if task is not None else iter(())
+            for digest in digests:
+                if digest is not None and digest in previous:
+                    job = previous[digest]
+                    reused += 1
+                else:
+                    item = next(normalized)
+                    job = Job.from_dict(item) if item is not None else None
+                if digest is not None:
+                    page_items[digest] = job
+                if job is not None:
+                    jobs.append(job)
+    finally:
+        for _, task in chunks:
+            if task is not None:
+                task.cancel()
+    return jobs, page_items, reused
+
+async def _load_client(src_name: str, pages: PageSource) -> List[Job]:
+    """
+    Fetches one source and filters/normalizes it page by page, as each page
+    arrives. Work done for unchanged pages and items in the previous load is
+    reused. Upstream failures propagate.
+
+    Pages go through a "normalize" then a "collect" pipeline stage joined by
+    bounded queues: when normalizing falls behind, page fetching waits, so at
+    most about INGEST_QUEUE_SIZE raw pages are held at once instead of the
+    whole source.
+
+    With several normalize workers pages can finish out of order; the kept
+    jobs are still assembled in page order, so the source's job order only
+    depends on the upstream's.
+    """
+    start_time = time.monotonic() # Start timing
+    # page sequence number -> that page's kept jobs
+    kept_by_page: Dict[int, List[Job]] = {}
+    raw_count = 0
+    page_count = 0
+    previous_pages = _page_memo.get(src_name, {})
+    previous_items = _item_memo.get(src_name, {})
+    pages_memo: Dict[int, Tuple[list, List[Job], ItemMemo]] = {}
+    items_memo: ItemMemo = {}
+    reused_pages = 0
+    reused_items = 0
+
+    async def fetched_pages() -> AsyncIterator[Tuple[int, list]]:
+        nonlocal page_count, raw_count
+        async for raw in pages():
+            if not isinstance(raw, list):
+                logger.warning(f"client {src_name} returned non-list page; ignoring")
+                continue
+            page_count += 1
+            raw_count += len(raw)
+            yield page_count, raw
+
+    async def normalize(page: Tuple[int, list]) -> Tuple[int, Tuple[list, List[Job], ItemMemo]]:
+        nonlocal reused_pages, reused_items
+        seq, raw = page
+        hit = previous_pages.get(id(raw))
+        if hit is not None and hit[0] is raw:
+            reused_pages += 1
+            reused_items += len(raw)
+            return seq, hit
+        if offloader.mode == INLINE:
+            jobs, page_items, reused = _normalize_page(src_name, raw, previous_items)
+        else:
+            jobs, page_items, reused = await _normalize_page_offloaded(src_name, raw, previous_items)
+        reused_items += reused
+        return seq, (raw, jobs, page_items)
+
+    async def collect(page: Tuple[int, Tuple[list, List[Job], ItemMemo]]):
+        seq, result = page
+        raw, jobs, page_items = result
+        # A raw page is only worth keeping if the HTTP cache can hand it back again.
+        if trace.cacheable:
+            pages_memo[id(raw)] = result
+        items_memo.update(page_items)
+        kept_by_page[seq] = jobs
+
+    with trace_requests(src_name) as trace:
+        await Pipeline(
+            Stage("normalize", normalize, settings.INGEST_NORMALIZE_WORKERS, settings.INGEST_QUEUE_SIZE),
+            Stage("collect", collect, 1, settings.INGEST_QUEUE_SIZE),
+        ).run(fetched_pages())
+    kept = [job for seq in sorted(kept_by_page) for job in kept_by_page[seq]]
+    # Replaced wholesale, so items that left the feed are forgotten.
+    _item_memo[src_name] = items_memo
+    # Only hold on to raw pages that the HTTP cache can hand back again.
+    if trace.cacheable:
+        _page_memo[src_name] = pages_memo
+    else:
+        _page_memo.pop(src_name, None)
+    duration = (time.monotonic() - start_time) * 1000 # Calculate duration in ms
+    logger.info(f"client {src_name} fetched {page_count} page(s) in {duration:.2f} ms, {reused_pages} unchanged (304)") # Log duration
+    logger.info(
+        f"client {src_name} processed {raw_count} raw jobs ({reused_items} unchanged since last load), "
+        f"{len(kept)} jobs kept after filtering and normalization."
+    )
+    return kept
+
+async def _guarded_load(src_name: str, pages: PageSource) -> List[Job]:
+    """
+    _load_client behind the source's circuit breaker: while it is open the
+    source fails instantly (the cache keeps serving its last good data) instead
+    of costing a full retry cycle on every ingest.
+    """
+    breaker = source_breakers.get(src_name)
+    if not breaker.allow():
+        raise CircuitOpenError(f"circuit for {src_name} is open")
+    start_time = time.monotonic()
+    try:
+        jobs = await _load_client(src_name, pages)
+    except Exception as e:
+        breaker.record_failure(time.monotonic() - start_time, e)
+        raise
+    breaker.record_success(time.monotonic() - start_time)
+    return jobs
+
+async def _run_client(src_name: str, fn: PageSource) -> List[Job]:
+    try:
+        return await source_cache.get(src_name, lambda: _guarded_load(src_name, fn))
+    except CircuitOpenError as e:
+        logger.info(f"Skipping client {src_name}: {e}")
+        return []
     except Exception as e:
         logger.exception(f"Error fetching or processing jobs for client {src_name}: {e}")
         return []
 
-async def fetch_all_jobs() -> List[Dict]:
-    clients = [
-        ("arbeitnow", JobAPIClients.fetch_arbeitnow),
-        ("jobicy", JobAPIClients.fetch_jobicy),
-        ("remotive", JobAPIClients.fetch_remotive),
-        ("adzuna", JobAPIClients.fetch_adzuna),
-        ("jooble", JobAPIClients.fetch_jooble),
-        ("careerjet", JobAPIClients.fetch_careerjet),
-    ]
-    tasks = [_run_client(name, fn) for name, fn in clients]
-    results = await asyncio.gather(*tasks, return_exceptions=False)
-    
-    flattened: List[Dict] = []
-    for r in results:
-        flattened.extend(r)
-        
-    # Add 'dedup_key' to each job and then deduplicate
-    unique_jobs = {}
-    for job in flattened:
+async def fetch_all_jobs() -> List[Job]:
+    """
+    Fetches, filters, normalizes and deduplicates jobs from every source.
+    Calls made while an ingest is already running join it rather than starting another.
+    """
+    return await ingest_flight.do("fetch_all_jobs", _fetch_all_jobs)
+
+CLIENTS: List[Tuple[str, PageSource]] = [
+    ("arbeitnow", lambda: walk_pages(JobAPIClients.fetch_arbeitnow)),
+    ("jobicy", lambda: single_page(JobAPIClients.fetch_jobicy)),
+    ("remotive", lambda: single_page(JobAPIClients.fetch_remotive)),
+    ("adzuna", lambda: single_page(JobAPIClients.fetch_adzuna)),
+    ("jooble", lambda: walk_pages(JobAPIClients.fetch_jooble)),
+    ("careerjet", lambda: single_page(JobAPIClients.fetch_careerjet)),
+]
+
+
+def _keyed(jobs: List[Job]) -> List[Tuple[str, Job]]:
+    """(fingerprint, job) for every job with a usable URL."""
+    keyed: List[Tuple[str, Job]] = []
+    for job in jobs:
         # Filter out jobs with empty or invalid URLs before deduplication
-        if not job.get('url') or not (job['url'].startswith('http://') or job['url'].startswith('https://')):
-            logger.warning(f"Skipping job due to invalid/empty URL: {job.get('title')} at {job.get('company')}")
+        if not job.url or not (job.url.startswith('http://') or job.url.startswith('https://')):
+            logger.warning(f"Skipping job due to invalid/empty URL: {job.title} at {job.company}")
             continue
-
         # The fingerprint serves as our unique identifier or "dedup_key"
-        key = _fingerprint(job)
+        keyed.append((_fingerprint(job), job))
+    return keyed
+
+
+def _merge_keyed(keyed: List[Tuple[str, Job]], unique_jobs: Dict[str, Job]) -> List[Job]:
+    """
+    Adds the jobs not already in `unique_jobs` to it, setting their dedup_key,
+    and returns them.
+    """
+    added: List[Job] = []
+    for key, job in keyed:
         if key not in unique_jobs:
-            job['dedup_key'] = key  # Store the key in the job dictionary
+            job.dedup_key = key  # Store the key on the job record
             unique_jobs[key] = job
-            
-    logger.info(f"fetch_all_jobs: unique_count={len(unique_jobs)}")
+            added.append(job)
+    return added
+
+
+def _dedup_exact(jobs: List[Job], unique_jobs: Dict[str, Job]) -> List[Job]:
+    """Exact (fingerprint) dedup of `jobs` against `unique_jobs`; returns the jobs added."""
+    return _merge_keyed(_keyed(jobs), unique_jobs)
+
+
+async def _fetch_all_jobs() -> List[Job]:
+    # Each source's jobs enter the dedup stage as soon as the source finishes
+    # rather than after a gather of every source. Fingerprints are taken as
+    # batches arrive; the merge follows CLIENTS order, so which record of a
+    # duplicate wins does not depend on which source answered first.
+    rank = {name: i for i, (name, _) in enumerate(CLIENTS)}
+    keyed: Dict[int, List[Tuple[str, Job]]] = {}
+
+    async def fingerprint(batch: Tuple[str, List[Job]]):
+        name, jobs = batch
+        keyed[rank[name]] = _keyed(jobs)
+
+    await Pipeline(
+        Stage("dedup", fingerprint, 1, settings.INGEST_QUEUE_SIZE),
+    ).run(iter_source_batches())
+
+    unique_jobs: Dict[str, Job] = {}
+    for i in sorted(keyed):
+        _merge_keyed(keyed.pop(i), unique_jobs)
+
+    near_duplicates = 0
+    if settings.NEAR_DEDUP_ENABLED:
+        # Same role reposted on another board (new URL, reworded title): keep the
+        # first posting, whose dedup_key becomes the cluster's ID. Seconds of CPU
+        # at 100k jobs, so it runs on a worker thread like the snapshot's index
+        # builds; the single-flighted ingest is its only caller.
+        kept, near_duplicates = await asyncio.to_thread(collapse_near_duplicates, list(unique_jobs.values()))
+        unique_jobs = {job.dedup_key: job for job in kept}
+
+    previous = job_store.snapshot.job_map
+    added = changed = 0
+    for key, job in unique_jobs.items():
+        old = previous.get(key)
+        if old is None:
+            added += 1
+        elif old is not job and old != job:
+            changed += 1
+    removed = sum(1 for key in previous if key not in unique_jobs)
+    last_ingest.update(
+        added=added, changed=changed, removed=removed, unique=len(unique_jobs), near_duplicates=near_duplicates
+    )
+    logger.info(
+        f"fetch_all_jobs: unique_count={len(unique_jobs)} near_duplicates={near_duplicates} "
+        f"added={added} changed={changed} removed={removed}"
+    )
     return list(unique_jobs.values())
+
+class StreamDedup:
+    """
+    The ingest's dedup (exact, then near-duplicate) applied batch by batch as
+    sources arrive. Jobs already sent are never replaced: a later batch only
+    adds jobs, or, when one of its jobs joins two earlier near-duplicate
+    clusters, reports the folded job's dedup_key as removed.
+
+    The near-duplicate index keeps its LSH buckets between batches, so each
+    batch costs the same whatever was sent before it.
+    """
+
+    def __init__(self):
+        self._unique: Dict[str, Job] = {}
+        self._sent: List[Job] = []
+        self._near = NearDuplicateIndex() if settings.NEAR_DEDUP_ENABLED else None
+        self._folded = 0
+
+    @property
+    def jobs(self) -> List[Job]:
+        """Every job sent and not removed since, in the order sent."""
+        near = self._near
+        if near is None:
+            return self._sent
+        return [job for i, job in enumerate(near.jobs) if near.is_root(i)]
+
+    @property
+    def total(self) -> int:
+        """len(self.jobs), without building the list."""
+        return len(self._sent) if self._near is None else len(self._near.jobs) - self._folded
+
+    def add(self, batch: List[Job]) -> Tuple[List[Job], List[str]]:
+        """Returns (jobs to add, dedup_keys of jobs sent earlier to drop)."""
+        fresh = _dedup_exact(batch, self._unique)
+        near = self._near
+        if near is None:
+            self._sent.extend(fresh)
+            return fresh, []
+        start = len(near.jobs)
+        # Earlier jobs come first, so they stay the canonical records. Only
+        # roots can be folded, and every earlier root has been sent.
+        folded = near.add(fresh)
+        self._folded += len(folded)
+        removed = [near.jobs[i].dedup_key for i in folded if i < start]
+        added = [job for i, job in enumerate(fresh, start) if near.is_root(i)]
+        return added, removed
+
+
+async def iter_source_batches() -> AsyncIterator[Tuple[str, List[Job]]]:
+    """
+    Yields (source, jobs) for every source as soon as its load completes,
+    fastest first, under the same deadline as a full ingest. Loads go through
+    the source cache, so fresh sources answer at once and a cron ingest running
+    at the same time is joined rather than duplicated.
+    """
+    async def run(name: str, fn: PageSource) -> Tuple[str, List[Job]]:
+        return name, await _run_client(name, fn)
+
+    # Tasks copy the context on creation, so they all carry the deadline.
+    with deadline_budget(settings.INGEST_DEADLINE_SECONDS):
+        tasks = [asyncio.ensure_future(run(name, fn)) for name, fn in CLIENTS]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away: the shared source loads carry on (they are
+        # shielded) and still land in the source cache.
+        for task in tasks:
+            task.cancel()
+
+
+async def _snapshot_batches() -> AsyncIterator[Tuple[str, List[Job]]]:
+    snapshot = await job_store.wait_ready(timeout=settings.TIMEOUT)
+    by_source: Dict[str, List[Job]] = {}
+    for job in snapshot.jobs:
+        by_source.setdefault(job.source, []).append(job)
+    for batch in by_source.items():
+        yield batch
+
+
+def stream_batches() -> AsyncIterator[Tuple[str, List[Job]]]:
+    """
+    Per-source job batches for /jobs/stream. The ingest leader (or a single
+    worker) loads the sources as they arrive; a follower in multi-worker mode
+    never calls upstream itself and streams the leader's snapshot by source.
+    """
+    return _snapshot_batches() if _is_follower() else iter_source_batches()
+
+
+async def refresh_job_store() -> JobSnapshot:
+    """Runs one full ingest, publishes it as the new job snapshot and persists it."""
+    jobs = await fetch_all_jobs()
+    previous = job_store.snapshot
+    snapshot = await job_store.publish(jobs)
+    if job_storage is not None and snapshot is not previous:
+        try:
+            await job_storage.save(snapshot.jobs, snapshot.version)
+        except Exception as e:
+            logger.exception(f"Persisting snapshot v{snapshot.version} failed: {e}")
+    if shared_snapshot is not None and snapshot is not previous:
+        try:
+            await shared_snapshot.publish(snapshot)
+        except Exception as e:
+            logger.exception(f"Sharing snapshot v{snapshot.version} with workers failed: {e}")
+    return snapshot
+
+
+async def warm_job_store():
+    """Loads the last persisted jobs into the job store so a restart serves data immediately."""
+    if job_storage is None:
+        return
+    try:
+        jobs, version = await job_storage.load(max_age=settings.SOURCE_MAX_STALE_SECONDS)
+        await job_store.restore(jobs, version)
+    except Exception as e:
+        logger.exception(f"Warming job store from storage failed: {e}")
@@ -0,0 +1,247 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, FrozenSet, List, Dict, Optional, Tuple
+
+from app.analytics import AnalyticsEngine
+from app.cache import LRUCache
+from app.models import Job
+from app.config import settings
+from app.ranking import BM25Index
+from app.search_index import SearchIndex
+from app.utils import logger
+
+# Publishes adding/removing more jobs than this rebuild the analytics counts off the event loop
+ANALYTICS_INCREMENTAL_MAX = 1000
+
+
+@dataclass(frozen=True)
+class JobSnapshot:
+    """Immutable view of one ingest run. Never mutate; publish a new one instead."""
+    jobs: List[Job] = field(default_factory=list)
+    job_map: Dict[str, Job] = field(default_factory=dict)
+    stats: Dict = field(default_factory=dict)
+    index: SearchIndex = field(default_factory=lambda: SearchIndex([]))
+    # Relevance ranking for free-text `query` when the AI service is not used
+    ranker: BM25Index = field(default_factory=lambda: BM25Index([]))
+    # dedup_key -> version in which the job (last) appeared or was last edited
+    added_in: Dict[str, int] = field(default_factory=dict)
+    version: int = 0
+    created_at: float = 0.0
+    # Serialized/compressed responses rendered from this snapshot, keyed by query
+    responses: LRUCache = field(default_factory=lambda: LRUCache(settings.RESPONSE_CACHE_SIZE))
+
+    @property
+    def ready(self) -> bool:
+        return self.version > 0
+
+
+class JobStore:
+    """
+    Holds the latest deduplicated job snapshot.
+
+    The ingest (cron) is the only writer and replaces the whole snapshot in one
+    reference assignment, so readers always see a consistent list/map/stats triple
+    without locking.
+
+    Every publish gets the next version number. The store also keeps a bounded
+    change log (added or edited / removed dedup_keys per version) so clients can sync with
+    `changes(since)` instead of re-downloading the full list.
+    """
+
+    def __init__(self):
+        # Incremental counts for the current snapshot; updated from each publish's diff
+        self.analytics = AnalyticsEngine()
+        self._snapshot = JobSnapshot(stats=self.analytics.stats())
+        self._ready: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        # (version, added or edited keys, removed keys), oldest first
+        self._history: Deque[Tuple[int, FrozenSet[str], FrozenSet[str]]] = deque(maxlen=settings.CHANGE_LOG_VERSIONS)
+        # dedup_key -> version in which it was removed; pruned with the history
+        self._removed_in: Dict[str, int] = {}
+
+    @property
+    def snapshot(self) -> JobSnapshot:
+        return self._snapshot
+
+    def _ready_event(self) -> asyncio.Event:
+        if self._ready is None:
+            self._ready = asyncio.Event()
+            if self._snapshot.ready:
+                self._ready.set()
+        return self._ready
+
+    def _publish_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def publish(self, jobs: List[Job], version: Optional[int] = None) -> JobSnapshot:
+        """
+        Builds a new snapshot from the given jobs and swaps it in.
+
+        `version` is normally the next number; followers in multi-worker mode pass
+        the leader's version so every worker agrees on it.
+
+        An empty ingest never replaces a non-empty snapshot: when every upstream
+        fails at once we keep serving the last good data. An ingest with the same
+        jobs as the current snapshot, in any order, is not published again.
+
+        The search index and ranker are built on a worker thread (seconds at
+        100k jobs); requests keep being answered from the current snapshot until
+        the new one is swapped in. Publishes are serialized, so each one diffs
+        against the snapshot it replaces.
+        """
+        async with self._publish_lock():
+            current = self._snapshot
+            if not jobs and current.jobs:
+                logger.warning(f"job_store: ingest returned no jobs, keeping snapshot v{current.version}")
+                return current
+
+            job_map = {job.dedup_key: job for job in jobs}
+            # Compared by dedup_key, not position: the same jobs in another order
+            # are still the same snapshot.
+            if version is None and len(job_map) == len(current.job_map) and all(
+                (old := current.job_map.get(key)) is job or old == job for key, job in job_map.items()
+            ):
+                # Nothing changed: a new version would only use up a change-log entry,
+                # drop the rendered responses and rewrite the shared snapshot file.
+                logger.info(f"job_store: ingest unchanged, keeping snapshot v{current.version}")
+                return current
+
+            version = current.version + 1 if version is None else version
+            added = frozenset(job_map.keys() - current.job_map.keys())
+            removed = frozenset(current.job_map.keys() - job_map.keys())
+            # Same dedup_key, new content (e.g. an edited description). Unchanged
+            # items reuse their Job object, so most of these are identity checks.
+            changed = frozenset(
+                key for key, job in job_map.items()
+                if (old := current.job_map.get(key)) is not None and old is not job and old != job
+            )
+            added_in = {key: current.added_in.get(key, version) for key in job_map}
+            for key in changed:
+                added_in[key] = version
+
+            # A large diff (first publish, big turnover) recounts on the worker thread
+            # too: ~2s at 100k jobs. A small one is applied incrementally on the loop,
+            # together with the swap, since /jobs/stats reads the counts.
+            recount = len(added) + len(removed) + len(changed) > ANALYTICS_INCREMENTAL_MAX
+            index, ranker, engine = await asyncio.to_thread(self._indexes, jobs, recount)
+            if engine is not None:
+                self.analytics = engine
+            else:
+                self.analytics.update(current.job_map, job_map)
+            snapshot = self._build(jobs, job_map, added_in, version, self.analytics.stats(), index, ranker)
+            self._record_changes(version, added | changed, removed)
+            self._snapshot = snapshot
+            self._ready_event().set()
+        logger.info(
+            f"job_store: published snapshot v{snapshot.version} with {len(jobs)} jobs "
+            f"(+{len(added)} / ~{len(changed)} / -{len(removed)})"
+        )
+        return snapshot
+
+    async def restore(self, jobs: List[Job], version: int) -> JobSnapshot:
+        """
+        Installs jobs loaded from persistent storage as the starting snapshot,
+        keeping the stored version so /jobs/changes cursors stay monotonic across
+        restarts. A no-op once a live ingest has already published.
+        """
+        async with self._publish_lock():
+            if self._snapshot.ready or not jobs:
+                return self._snapshot
+            job_map = {job.dedup_key: job for job in jobs}
+            index, ranker, self.analytics = await asyncio.to_thread(self._indexes, jobs, True)
+            snapshot = self._build(
+                jobs, job_map, dict.fromkeys(job_map, version), version, self.analytics.stats(), index, ranker
+            )
+            self._snapshot = snapshot
+            self._ready_event().set()
+        logger.info(f"job_store: restored snapshot v{version} with {len(jobs)} jobs from storage")
+        return snapshot
+
+    @staticmethod
+    def _indexes(jobs: List[Job], recount: bool) -> Tuple[SearchIndex, BM25Index, Optional[AnalyticsEngine]]:
+        """Runs on a worker thread: builds everything that does not touch the live snapshot."""
+        engine = None
+        if recount:
+            engine = AnalyticsEngine()
+            engine.reset(jobs)
+        return SearchIndex(jobs), BM25Index(jobs), engine
+
+    @staticmethod
+    def _build(
+        jobs: List[Job],
+        job_map: Dict[str, Job],
+        added_in: Dict[str, int],
+        version: int,
+        stats: Dict,
+        index: SearchIndex,
+        ranker: BM25Index,
+    ) -> JobSnapshot:
+        return JobSnapshot(
+            jobs=jobs,
+            job_map=job_map,
+            stats=stats,
+            index=index,
+            ranker=ranker,
+            added_in=added_in,
+            version=version,
+            created_at=time.time(),
+        )
+
+    def _record_changes(self, version: int, added: FrozenSet[str], removed: FrozenSet[str]):
+        if len(self._history) == self._history.maxlen:
+            expired_version, _, expired_removed = self._history[0]
+            for key in expired_removed:
+                if self._removed_in.get(key) == expired_version:
+                    del self._removed_in[key]
+        self._history.append((version, added, removed))
+        for key in removed:
+            self._removed_in[key] = version
+        for key in added:
+            self._removed_in.pop(key, None)
+
+    def changes(self, since: int) -> Dict[str, Any]:
+        """
+        Returns the delta between version `since` and the current snapshot:
+        jobs added or edited after `since` (in `added`; the client replaces its
+        copy by dedup_key) and dedup_keys removed after `since`.
+
+        When `since` is older than the retained change log (or newer than the
+        current version, e.g. after a restart) the response has `reset: true`
+        and carries the full job list; the client should replace its copy.
+        """
+        snapshot = self._snapshot
+        history = list(self._history)
+        oldest = history[0][0] if history else snapshot.version + 1
+        if since > snapshot.version or since < oldest - 1:
+            return {"version": snapshot.version, "reset": True, "added": snapshot.jobs, "removed": []}
+
+        touched: set = set()
+        for version, added, removed in history:
+            if version > since:
+                touched |= added
+                touched |= removed
+        added_jobs = [
+            snapshot.job_map[key] for key in touched
+            if key in snapshot.job_map and snapshot.added_in[key] > since
+        ]
+        removed_keys = [
+            key for key in touched
+            if key not in snapshot.job_map and self._removed_in.get(key, 0) > since
+        ]
+        return {"version": snapshot.version, "reset": False, "added": added_jobs, "removed": removed_keys}
+
+    async def wait_ready(self, timeout: float) -> JobSnapshot:
+        """Waits (bounded) for the first ingest to land, then returns the current snapshot."""
+        if not self._snapshot.ready:
+            try:
+                await asyncio.wait_for(self._ready_event().wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"job_store: no snapshot after {timeout}s, serving empty result")
+        return self._snapshot
+
+
+job_store = JobStore()
@@ -1,43 +1,75 @@
-from fastapi import APIRouter
-from typing import Optional
-from app.job_service import fetch_all_jobs
-from app.api_clients import fetch_ai_search_results
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Iterator, List, Optional
+import orjson
+from app.job_store import job_store
+from app.job_service import StreamDedup, stream_batches
+from app.models import Job
+from app.api_clients import cached_ai_search_results
 from app.analytics import compute_analytics
 from app.config import settings
+from app.responses import PreparedResponse, serve_prepared
 from app.utils import logger
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 100
+EXPORT_CHUNK_LINES = 500
+
+
 @router.get("/")
-async def get_jobs(query: Optional[str] = None):
+async def get_jobs(
+    request: Request,
+    query: Optional[str] = None,
+    q: Optional[str] = None,
+    category: Optional[str] = Query(None, description="Remote / On-site KSA"),
+    source: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+):
     """
-    Fetches jobs, attempting to use an AI search service if a query is provided.
-    If AI search fails or is not used, it returns all KSA-relevant jobs,
-    allowing the frontend to perform client-side filtering.
+    Serves jobs from the in-memory snapshot kept fresh by the cron ingest,
+    attempting to use an AI search service if a query is provided.
+    If AI search fails or is not used, returns one page of KSA-relevant jobs
+    matching the `q`/`category`/`source`/`company`/`location` filters, answered
+    from the snapshot's inverted index.
+
+    The two text parameters differ: `query` is relevance search (AI, or BM25
+    top results best first, as sent by the frontend's search box); `q` is a
+    filter keeping only jobs that contain every token, in snapshot order.
+    Both can be combined, in which case `q` narrows what `query` ranks.
+
+    Non-AI responses are serialized and compressed once per snapshot and query,
+    carry a strong ETag and honour If-None-Match / Accept-Encoding.
     """
-    # Always fetch all jobs first, as this is our master list.
-    try:
-        all_jobs = await fetch_all_jobs()
-        job_map = {job['dedup_key']: job for job in all_jobs}
-    except Exception as e:
-        logger.exception("get_jobs.fetch_all_jobs failed: %s", str(e))
-        all_jobs = []
-        job_map = {}
+    # The snapshot is our master list; requests never call upstream APIs directly.
+    # Only a cold start (before the first ingest lands) waits, and only up to TIMEOUT.
+    snapshot = await job_store.wait_ready(timeout=settings.TIMEOUT)
+    all_jobs = snapshot.jobs
 
     # Attempt AI search if a query is provided
     if query and settings.AI_SERVICE_URL:
         logger.info(f"Initiating AI search with query: '{query}'")
-        ai_results = await fetch_ai_search_results(query)
+        ai_results = await cached_ai_search_results(
+            query,
+            snapshot.version,
+            # Only the BM25 top candidates go to the AI service, not the whole corpus.
+            candidates=lambda normalized: [
+                all_jobs[pos].to_dict() for pos, _ in snapshot.ranker.top_k(normalized, settings.AI_CANDIDATES)
+            ] if settings.AI_CANDIDATES else None,
+        )
 
         if ai_results:
             # NEW ASSUMPTION: AI returns a list of full job objects that it selected.
             # These jobs should ideally already be normalized and include a dedup_key.
             ai_filtered_jobs = ai_results.get("results", [])
-            
+
             # Ensure each AI-returned job has a dedup_key for consistency.
             # If not present, we can generate one or use a fallback.
             # For simplicity, we'll assume AI-returned jobs are well-formed.
-            
+
             logger.info(f"AI search successful. Found {len(ai_filtered_jobs)} matching jobs.")
             # Stats for AI-powered results should be computed on these AI-filtered jobs.
             # However, for consistency with BUG-8 fix (next), we'll compute stats on the `ai_filtered_jobs`
@@ -48,12 +80,146 @@ async def get_jobs(query: Optional[str] = None):
             }
         else:
             logger.warning("AI search failed or returned no results. Falling back to normal mode.")
-    
+
     # Fallback case: No query, AI disabled, or AI failed.
-    # Return all jobs and let the frontend handle filtering.
-    # Stats are computed on the ALL_JOBS list
-    return {
-        "jobs": all_jobs,
-        "stats": compute_analytics(all_jobs), # Compute stats on all_jobs
-        "ai_powered": False
-    }
+    # Filter and paginate server-side; counts per category are taken before the
+    # category filter so the frontend can label both tabs. A `query` is answered
+    # with the BM25 top results, best first, within the other filters.
+    page_size = page_size or settings.PAGE_SIZE
+    cache_key = (query, q, category, source, company, location, page, page_size)
+    prepared = snapshot.responses.get(cache_key)
+    if prepared is None:
+        index = snapshot.index
+        if query:
+            allowed = None
+            if q or source or company or location:
+                allowed = set(index.search(q=q, source=source, company=company, location=location))
+            ranked = [pos for pos, _ in snapshot.ranker.top_k(query, settings.RANKED_TOP_K, allowed)]
+            counts = index.category_counts(ranked)
+            matched = ranked
+            if category:
+                in_category = set(index.search(category=category))
+                matched = [pos for pos in ranked if pos in in_category]
+        else:
+            matched = index.search(q=q, source=source, company=company, location=location)
+            counts = index.category_counts(matched)
+            if category:
+                matched = index.search(q=q, category=category, source=source, company=company, location=location)
+
+        start = (page - 1) * page_size
+        page_jobs = [all_jobs[pos] for pos in matched[start:start + page_size]]
+
+        # Stats are computed on the ALL_JOBS list
+        prepared = PreparedResponse({
+            "jobs": page_jobs,
+            "total": len(matched),
+            "page": page,
+            "page_size": page_size,
+            "category_counts": counts,
+            "stats": snapshot.stats, # Precomputed on all_jobs at publish time
+            "ai_powered": False
+        })
+        snapshot.responses.set(cache_key, prepared)
+    return serve_prepared(request, prepared)
+
+
+@router.get("/changes")
+async def get_job_changes(since: int = Query(0, ge=0)):
+    """
+    Incremental sync: returns jobs added or edited and dedup_keys removed since
+    snapshot version `since`; an edited job replaces the client's copy with the
+    same dedup_key. Clients store the returned `version` and pass it next time.
+    A `reset: true` response carries the full list and replaces the client's copy.
+    """
+    await job_store.wait_ready(timeout=settings.TIMEOUT)
+    return job_store.changes(since)
+
+
+@router.get("/stats")
+async def get_job_stats(
+    category: Optional[str] = Query(None, description="Remote / On-site KSA"),
+    source: Optional[str] = None,
+    top: int = Query(50, ge=1, le=500),
+):
+    """
+    Dashboard stats for the current snapshot, optionally restricted to one
+    category and/or source. Served from the incrementally maintained counts,
+    so polling it never rescans the job list.
+    """
+    await job_store.wait_ready(timeout=settings.TIMEOUT)
+    return job_store.analytics.stats(category=category, source=source, k=top)
+
+
+def _ndjson_lines(jobs: List[Job], positions: List[int], fields: Optional[List[str]]) -> Iterator[bytes]:
+    """Yields the selected jobs as NDJSON, EXPORT_CHUNK_LINES per chunk."""
+    chunk = []
+    for pos in positions:
+        job = jobs[pos]
+        record = job if fields is None else {name: getattr(job, name) for name in fields}
+        chunk.append(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        if len(chunk) == EXPORT_CHUNK_LINES:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
+@router.get("/export.ndjson")
+async def export_jobs(
+    fields: Optional[str] = Query(None, description="Comma-separated projection, e.g. title,url,company"),
+    q: Optional[str] = None,
+    category: Optional[str] = Query(None, description="Remote / On-site KSA"),
+    source: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+):
+    """
+    Streams the current snapshot (optionally filtered and projected) as
+    newline-delimited JSON, one job per line. Lines are encoded in small chunks
+    as the client reads, so memory stays flat regardless of dataset size.
+    """
+    projection = None
+    if fields:
+        projection = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in projection if name not in Job.__slots__]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    snapshot = await job_store.wait_ready(timeout=settings.TIMEOUT)
+    positions = snapshot.index.search(q=q, category=category, source=source, company=company, location=location)
+    return StreamingResponse(
+        _ndjson_lines(snapshot.jobs, positions, projection),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="ksa_jobs.ndjson"'},
+    )
+
+
+def _sse(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _stream_events() -> AsyncIterator[bytes]:
+    dedup = StreamDedup()
+    sources = {}
+    async for name, batch in stream_batches():
+        added, removed = dedup.add(batch)
+        sources[name] = len(added)
+        yield _sse("jobs", {"source": name, "jobs": added, "removed": removed, "total": dedup.total})
+    yield _sse("done", {"total": dedup.total, "sources": sources, "stats": compute_analytics(dedup.jobs)})
+
+
+@router.get("/stream")
+async def stream_jobs():
+    """
+    Server-Sent Events: one `jobs` event per source as soon as it has been
+    fetched, filtered and normalized, carrying the jobs not already sent
+    (deduplicated across batches) and the dedup_keys of earlier jobs folded
+    into a near-duplicate. A final `done` event carries the stats of the whole
+    set. The first jobs arrive after the fastest source, not the slowest.
+    Followers in multi-worker mode stream the leader's current snapshot.
+    """
+    return StreamingResponse(
+        _stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
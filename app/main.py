@@ -6,7 +6,14 @@ import uvicorn
 
 from .jobs_router import router as jobs_router
 from .cron import start_scheduler
-from .utils import logger, close_httpx_client
+from .job_service import ingest_flight, last_ingest, source_cache, warm_job_store
+from .circuit_breaker import OPEN, source_breakers
+from .shared_snapshot import shared_snapshot
+from .utils import logger, close_httpx_client, http_stats
+from .http_cache import http_cache
+from .api_clients import ai_search_cache, ai_search_flight
+from .offload import offloader
+from .pipeline import pipeline_stats
 from .config import settings  # Import settings
 
 
@@ -76,7 +83,28 @@ async def global_exception_handler(request: Request, exc: Exception):
 # --------------------------------------------------------
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    # Always 200 while the app serves: an open source circuit only degrades
+    # freshness, the snapshot keeps being served.
+    sources = source_breakers.stats()
+    degraded = any(s["state"] == OPEN for s in sources.values())
+    return {"status": "degraded" if degraded else "ok", "sources": sources}
+
+
+# --------------------------------------------------------
+# Metrics Endpoint
+# --------------------------------------------------------
+@app.get("/metrics")
+async def metrics():
+    return {
+        "ingest": {**ingest_flight.stats(), "last": last_ingest},
+        "source_cache": source_cache.stats(),
+        "http": http_stats(),
+        "http_cache": http_cache.stats(),
+        "ai_search": {**ai_search_cache.stats(), "coalesced": ai_search_flight.coalesced},
+        "offload": offloader.stats(),
+        "pipeline": pipeline_stats(),
+        "worker": shared_snapshot.stats() if shared_snapshot is not None else None,
+    }
 
 
 # --------------------------------------------------------
@@ -96,8 +124,15 @@ app.mount("/", StaticFiles(directory="public", html=True), name="public")
 # --------------------------------------------------------
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Starting job scheduler...")
-    start_scheduler()
+    logger.info("Warming job store from storage...")
+    await warm_job_store()
+    if shared_snapshot is not None:
+        # Multi-worker mode: only the elected leader runs the scheduler.
+        logger.info("Electing ingest leader...")
+        shared_snapshot.start(on_leader=start_scheduler)
+    else:
+        logger.info("Starting job scheduler...")
+        start_scheduler()
 
 
 # --------------------------------------------------------
@@ -107,3 +142,4 @@ async def startup_event():
 async def shutdown_event():
     logger.info("Shutting down httpx client...")
     await close_httpx_client()
+    offloader.shutdown()
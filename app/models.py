@@ -0,0 +1,62 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
+class Job:
+    """
+    Compact in-memory job record.
+
+    Fields mirror the dict produced by normalize_job (same names, same order,
+    so orjson serializes it to the identical JSON without a to_dict step).
+    Low-cardinality strings (source, company, jobType, jobCategory) are interned,
+    so thousands of jobs share one string object per distinct value.
+    """
+    source: str
+    title: str
+    company: str
+    url: str
+    description: str
+    jobType: str
+    jobIndustry: str
+    location: str
+    remote: bool
+    pubDate: Any
+    jobCategory: str
+    dedup_key: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Job":
+        return cls(
+            _intern(data["source"]),
+            data["title"],
+            _intern(data["company"]),
+            data["url"],
+            data["description"],
+            _intern(data["jobType"]),
+            _intern(data["jobIndustry"]),
+            data["location"],
+            data["remote"],
+            data["pubDate"],
+            _intern(data["jobCategory"]),
+            data.get("dedup_key", ""),
+        )
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    # Read-only mapping access, so code that handles both snapshot jobs and
+    # plain dicts (e.g. AI-service results in compute_analytics) works on either.
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
@@ -1,5 +1,10 @@
-from typing import Dict
-from app.filters import is_ksa_on_site_job, is_truly_remote_job
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+from app.filters import is_ksa_on_site_job, is_truly_remote_job, classify_fields, _location_text
+from app.utils import logger
 
 
 def _to_str_or_empty(value) -> str:
@@ -73,4 +78,146 @@ def normalize_job(raw: Dict, source: str) -> Dict:
     normalizer_func = normalizers.get(source, _normalize_default)
 
     # ALL normalizers now accept (raw, source)
-    return normalizer_func(raw, source)
\ No newline at end of file
+    return normalizer_func(raw, source)
+
+
+# --------------------------------------------------------------------------
+# Fused filter + normalize stage
+# --------------------------------------------------------------------------
+# Field lookups precomputed as key tuples, tried in the same order as the
+# chained `or` expressions in _normalize_default and
+# filters._extract_job_text_fields so the output is identical.
+
+Keys = Tuple[str, ...]
+
+
+class _SourceSpec:
+    """Per-source field mapping used by filter_and_normalize."""
+    __slots__ = ("title", "company", "url", "description", "job_type", "industry", "location", "pub_date",
+                 "filter_location", "filter_job_type", "adzuna", "hash_keys")
+
+    def __init__(self, adzuna: bool = False):
+        self.title: Keys = ("title", "jobTitle", "name")
+        self.company: Keys = ("company", "company_name", "companyName")
+        self.url: Keys = ("url", "jobUrl", "link", "apply_url")
+        self.description: Keys = ("description", "jobDescription")
+        self.job_type: Keys = ("type", "jobType", "job_type")
+        self.industry: Keys = ("industry", "jobIndustry")
+        self.location: Keys = ("location", "jobGeo", "candidate_required_location")
+        self.pub_date: Keys = ("pubDate", "publication_date", "date")
+        # The classifier reads location/type with its own key order
+        self.filter_location: Keys = ("location", "candidate_required_location", "jobGeo", "jobLocation")
+        self.filter_job_type: Keys = ("jobType", "type", "job_type", "employment_type", "workType")
+        self.adzuna = adzuna
+        # Every key the output depends on, for content_hash
+        keys = (self.title + self.company + self.url + self.description + self.job_type + self.industry
+                + self.location + self.pub_date + self.filter_location + self.filter_job_type + ("remote",))
+        if adzuna:
+            keys += ("redirect_url",)
+        self.hash_keys: Keys = tuple(dict.fromkeys(keys))
+
+
+_DEFAULT_SPEC = _SourceSpec()
+_SOURCE_SPECS = {
+    "adzuna": _SourceSpec(adzuna=True),
+}
+
+
+def _first(raw: Dict, keys: Keys):
+    """Same result as `raw.get(k1) or raw.get(k2) or ...`: first truthy value, else the last one."""
+    value = None
+    for key in keys:
+        value = raw.get(key)
+        if value:
+            return value
+    return value
+
+
+def _filter_and_normalize_one(raw: Dict, source: str, spec: _SourceSpec) -> Optional[Dict]:
+    # Shared by the classifier and the normalized output
+    title = _first(raw, spec.title)
+    description = _first(raw, spec.description)
+
+    category = classify_fields(
+        raw.get("remote"),
+        _location_text(_first(raw, spec.filter_location) or ""),
+        str(_first(raw, spec.filter_job_type) or "").lower().strip(),
+        str(title or "").lower().strip(),
+        str(description or "").lower().strip()[:500],
+    )
+    if not category:
+        return None
+
+    location = _first(raw, spec.location)
+    remote = raw.get("remote")
+    if not isinstance(remote, bool):
+        remote = location is not None and "remote" in _to_str_or_empty(location).lower()
+
+    normalized = {
+        "source": source,
+        "title": _to_str_or_empty(title),
+        "company": _to_str_or_empty(_first(raw, spec.company)),
+        "url": _to_str_or_empty(_first(raw, spec.url)),
+        "description": _to_str_or_empty(description),
+        "jobType": _to_str_or_empty(_first(raw, spec.job_type)),
+        "jobIndustry": _to_str_or_empty(_first(raw, spec.industry)),
+        "location": _to_str_or_empty(location),
+        "remote": bool(remote),
+        "pubDate": _first(raw, spec.pub_date) or None,
+        "jobCategory": category,
+    }
+    if spec.adzuna:
+        # Same overrides as normalize_adzuna
+        normalized.update({
+            "company": (raw.get("company") or {}).get("display_name", ""),
+            "location": (raw.get("location") or {}).get("display_name", ""),
+            "url": raw.get("redirect_url", normalized["url"]),
+        })
+    return normalized
+
+
+def content_hash(raw: Dict, source: str) -> Optional[bytes]:
+    """
+    blake2b digest over exactly the fields filter_and_normalize reads for
+    `source`: equal digests mean equal output. None if a value cannot be hashed.
+    """
+    spec = _SOURCE_SPECS.get(source, _DEFAULT_SPEC)
+    try:
+        canonical = orjson.dumps([raw.get(key) for key in spec.hash_keys], option=orjson.OPT_NON_STR_KEYS)
+    except (TypeError, AttributeError):
+        return None
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+def filter_and_normalize_item(raw: Dict, source: str) -> Optional[Dict]:
+    """filter_and_normalize for one item: its normalized dict, or None if dropped or invalid."""
+    try:
+        return _filter_and_normalize_one(raw, source, _SOURCE_SPECS.get(source, _DEFAULT_SPEC))
+    except Exception as e:
+        logger.exception(f"filter_and_normalize error for {source} item: {e}")
+        return None
+
+
+def filter_and_normalize(raw_items: List[Dict], source: str) -> List[Dict]:
+    """
+    Single pass over a source batch: extracts each item's fields once, decides
+    keep/drop plus jobCategory, and emits the same dict normalize_job would.
+    Items that fail to process are logged and dropped.
+    """
+    return [job for job in filter_and_normalize_items(raw_items, source) if job is not None]
+
+
+def filter_and_normalize_items(raw_items: List[Dict], source: str) -> List[Optional[Dict]]:
+    """
+    filter_and_normalize_item over a batch, one result per item (None: dropped).
+    Module-level so the ingest can hand it to a process pool.
+    """
+    spec = _SOURCE_SPECS.get(source, _DEFAULT_SPEC)
+    results: List[Optional[Dict]] = []
+    for raw in raw_items:
+        try:
+            results.append(_filter_and_normalize_one(raw, source, spec))
+        except Exception as e:
+            logger.exception(f"filter_and_normalize error for {source} item: {e}")
+            results.append(None)
+    return results
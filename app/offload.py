@@ -0,0 +1,84 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+from loguru import logger
+
+from app.config import settings
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+MODES = (INLINE, THREAD, PROCESS)
+
+
+class Offloader:
+    """
+    Runs the ingest's CPU-bound steps (JSON parsing, filter/normalize batches)
+    off the event loop, so /jobs/ and /health keep answering during an ingest.
+
+    - inline:  on the event loop, as before.
+    - thread:  in a thread pool. Still one interpreter, but the loop gets the
+               GIL back every switch interval instead of waiting out a batch.
+    - process: filter/normalize batches in a process pool (no GIL sharing).
+               Parsing stays on threads: a worker process would have to pickle
+               the decoded payload back, which costs the loop about as much as
+               parsing it.
+    """
+
+    def __init__(self, mode: str, workers: int):
+        if mode not in MODES:
+            logger.warning(f"offload: unknown INGEST_EXECUTOR {mode!r}, running inline")
+            mode = INLINE
+        self.mode = mode
+        self.workers = workers
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self.tasks = 0
+        self.parses = 0
+
+    def _executor(self, cpu: bool) -> Executor:
+        if cpu and self.mode == PROCESS:
+            if self._processes is None:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._processes = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._processes
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="ingest")
+        return self._threads
+
+    async def _submit(self, cpu: bool, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor(cpu), fn, *args)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """fn(*args) on the configured executor. In process mode fn and args must be picklable."""
+        if self.mode == INLINE:
+            return fn(*args)
+        self.tasks += 1
+        return await self._submit(True, fn, *args)
+
+    async def parse_json(self, content: bytes) -> Any:
+        """orjson.loads, on a worker thread for payloads of OFFLOAD_PARSE_MIN_BYTES and up."""
+        if self.mode == INLINE or len(content) < settings.OFFLOAD_PARSE_MIN_BYTES:
+            return orjson.loads(content)
+        self.parses += 1
+        return await self._submit(False, orjson.loads, content)
+
+    def shutdown(self):
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "tasks": self.tasks,
+            "parses": self.parses,
+        }
+
+
+offloader = Offloader(settings.INGEST_EXECUTOR, settings.INGEST_EXECUTOR_WORKERS)
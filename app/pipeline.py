@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+class StageStats:
+    """Counters for one stage name, summed over every pipeline that runs a stage of that name."""
+
+    __slots__ = ("items", "errors", "busy_seconds", "depth", "max_depth")
+
+    def __init__(self):
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.depth = 0  # items queued right now
+        self.max_depth = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "errors": self.errors,
+            "items_per_second": round(self.items / self.busy_seconds, 1) if self.busy_seconds else None,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+        }
+
+
+_stage_stats: Dict[str, StageStats] = {}
+
+
+def pipeline_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: s.stats() for name, s in _stage_stats.items()}
+
+
+class Stage:
+    """
+    One pipeline step: `workers` tasks taking items from a bounded queue and
+    passing fn(item) on to the next stage (a None result is dropped). A full
+    queue blocks whoever feeds it, so a slow stage holds back the stages before
+    it instead of letting work pile up in memory. The first exception fn raises
+    is kept in `error` and fails the pipeline run.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Awaitable[Any]], workers: int = 1, queue_size: int = 1):
+        self.name = name
+        self._fn = fn
+        self._workers = max(1, workers)
+        self._queue: asyncio.Queue = asyncio.Queue(max(1, queue_size))
+        self._stats = _stage_stats.setdefault(name, StageStats())
+        self.error: Optional[BaseException] = None
+
+    async def put(self, item: Any):
+        await self._queue.put(item)
+        self._stats.depth += 1
+        self._stats.max_depth = max(self._stats.max_depth, self._queue.qsize())
+
+    async def _work(self, downstream: Optional["Stage"]):
+        while True:
+            item = await self._queue.get()
+            self._stats.depth -= 1
+            start = time.monotonic()
+            try:
+                result = await self._fn(item)
+                self._stats.items += 1
+            except Exception as e:
+                # Dropping the item would hand back partial results as a success;
+                # the error is re-raised from Pipeline.run instead.
+                self._stats.errors += 1
+                logger.warning(f"pipeline stage {self.name} failed on an item: {e!r}")
+                if self.error is None:
+                    self.error = e
+                result = None
+            finally:
+                self._stats.busy_seconds += time.monotonic() - start
+            try:
+                if result is not None and downstream is not None:
+                    await downstream.put(result)
+            finally:
+                self._queue.task_done()
+
+    def start(self, downstream: Optional["Stage"]) -> List[asyncio.Task]:
+        return [asyncio.ensure_future(self._work(downstream)) for _ in range(self._workers)]
+
+    async def drain(self):
+        await self._queue.join()
+
+    def discard(self):
+        """Drops whatever is still queued (the pipeline was cancelled)."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._stats.depth -= 1
+
+
+class Pipeline:
+    """
+    Stages joined by bounded queues. run() feeds the first stage from an async
+    iterator, at the pace the stages downstream allow, and returns once every
+    item has passed through the last stage. If a stage fails on an item, run()
+    stops feeding and raises that exception.
+    """
+
+    def __init__(self, *stages: Stage):
+        self._stages = stages
+
+    def _raise_failure(self):
+        for stage in self._stages:
+            if stage.error is not None:
+                raise stage.error
+
+    async def run(self, source: AsyncIterator[Any]):
+        workers: List[asyncio.Task] = []
+        for stage, downstream in zip(self._stages, self._stages[1:] + (None,)):
+            workers.extend(stage.start(downstream))
+        try:
+            async for item in source:
+                await self._stages[0].put(item)
+                self._raise_failure()
+            # In order: a stage is only finished once the one before it can
+            # no longer hand it anything.
+            for stage in self._stages:
+                await stage.drain()
+                self._raise_failure()
+        finally:
+            # Stopped early: close the source so it cancels its own work (e.g. page fetches)
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for stage in self._stages:
+                stage.discard()
@@ -0,0 +1,112 @@
+import heapq
+import math
+import sys
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models import Job
+from app.search_index import tokenize
+
+
+# BM25F-style field weights: a term in the title counts as three occurrences.
+FIELD_WEIGHTS = (("title", 3), ("company", 2), ("location", 1), ("description", 1))
+K1 = 1.2
+B = 0.75
+# Postings are stored highest-impact first. A query scans at most this many per
+# term, so a term present in most of a 1M-job corpus still costs a bounded
+# amount; the skipped tail holds the weakest matches for that term.
+MAX_POSTINGS_SCANNED = 20_000
+
+_Analysis = Tuple[Tuple[str, ...], array, int]  # terms, weighted tf per term, doc length
+
+
+def _analyze(job: Job) -> _Analysis:
+    counts: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for token in tokenize(getattr(job, field)):
+            counts[token] += weight
+    # Interned so every document shares one string object per distinct term.
+    terms = tuple(sys.intern(term) for term in counts)
+    return terms, array("H", (min(tf, 0xFFFF) for tf in counts.values())), sum(counts.values())
+
+
+# id(job) -> (job, analysis) from the last build. Jobs carried over unchanged by
+# the incremental ingest are the same objects, so only new or edited jobs are
+# tokenized again.
+_analysis_memo: Dict[int, Tuple[Job, _Analysis]] = {}
+
+
+class BM25Index:
+    """
+    Okapi BM25 ranking over one job snapshot (title, company, description and
+    location), built once per publish.
+
+    BM25 contributions depend only on the term and the document, so they are
+    precomputed at build time ("impacts") and each term's postings are kept
+    sorted by impact. A query just sums impacts per document and keeps the top K.
+    """
+
+    def __init__(self, jobs: List[Job]):
+        global _analysis_memo
+        memo: Dict[int, Tuple[Job, _Analysis]] = {}
+        analyses: List[_Analysis] = []
+        for job in jobs:
+            hit = _analysis_memo.get(id(job))
+            analysis = hit[1] if hit is not None and hit[0] is job else _analyze(job)
+            memo[id(job)] = (job, analysis)
+            analyses.append(analysis)
+        _analysis_memo = memo
+
+        n = len(jobs)
+        avgdl = (sum(length for _, _, length in analyses) / n) if n else 1.0
+        # Built into flat arrays (no per-posting objects), then each term's
+        # postings are reordered by impact.
+        tf_docs: Dict[str, array] = {}
+        tf_scores: Dict[str, array] = {}
+        for pos, (terms, tfs, length) in enumerate(analyses):
+            norm = K1 * (1 - B + B * length / avgdl)
+            for term, tf in zip(terms, tfs):
+                docs = tf_docs.get(term)
+                if docs is None:
+                    docs = tf_docs[term] = array("I")
+                    tf_scores[term] = array("f")
+                docs.append(pos)
+                tf_scores[term].append(tf * (K1 + 1) / (tf + norm))
+
+        self._docs: Dict[str, array] = {}
+        self._impacts: Dict[str, array] = {}
+        for term, docs in tf_docs.items():
+            scores = tf_scores[term]
+            df = len(docs)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            order = sorted(range(df), key=scores.__getitem__, reverse=True)
+            self._docs[term] = array("I", [docs[i] for i in order])
+            self._impacts[term] = array("f", [idf * scores[i] for i in order])
+        self._size = n
+
+    def __len__(self) -> int:
+        return self._size
+
+    def top_k(self, query: str, k: int, allowed: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Returns up to `k` (position, score) pairs, best first, for jobs matching
+        at least one query term. `allowed` restricts the result to those
+        positions (the other filters); it is applied while scanning.
+        """
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term in set(tokenize(query)):
+            docs = self._docs.get(term)
+            if docs is None:
+                continue
+            impacts = self._impacts[term]
+            if allowed is None:
+                for doc, impact in zip(docs[:MAX_POSTINGS_SCANNED], impacts[:MAX_POSTINGS_SCANNED]):
+                    scores[doc] = get(doc, 0.0) + impact
+            else:
+                for doc, impact in zip(docs, impacts):
+                    if doc in allowed:
+                        scores[doc] = get(doc, 0.0) + impact
+        return heapq.nlargest(k, scores.items(), key=itemgetter(1))
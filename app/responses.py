@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: without it we only offer gzip
+    brotli = None
+
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class PreparedResponse:
+    """
+    A JSON body serialized once with orjson and pre-compressed, so serving it is
+    just picking bytes. Built per (snapshot, query) and cached on the snapshot.
+    """
+    __slots__ = ("etag", "identity", "gzip", "br")
+
+    def __init__(self, payload: Any):
+        self.identity = orjson.dumps(payload)
+        # Strong validator over the exact bytes: covers the dedup_keys in the
+        # page and any content edits made under an unchanged key.
+        self.etag = hashlib.blake2b(self.identity, digest_size=16).hexdigest()
+        self.gzip = gzip.compress(self.identity, compresslevel=GZIP_LEVEL)
+        self.br: Optional[bytes] = brotli.compress(self.identity, quality=BROTLI_QUALITY) if brotli else None
+
+
+def _accepted_encodings(header: str) -> dict:
+    """Parses Accept-Encoding into {coding: q}."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _choose_encoding(header: Optional[str], prepared: PreparedResponse) -> str:
+    if not header:
+        return "identity"
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    candidates = []
+    if prepared.br is not None:
+        candidates.append("br")
+    candidates.append("gzip")
+    best, best_q = "identity", 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        # Accept any encoding variant of the same body ("<etag>-br" etc.)
+        if tag.strip('"').split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def serve_prepared(request: Request, prepared: PreparedResponse) -> Response:
+    """Answers with 304, or with the best pre-compressed variant the client accepts."""
+    encoding = _choose_encoding(request.headers.get("accept-encoding"), prepared)
+    etag = f'"{prepared.etag}"' if encoding == "identity" else f'"{prepared.etag}-{encoding}"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+
+    if _etag_matches(request.headers.get("if-none-match"), prepared.etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding == "br":
+        body = prepared.br
+    elif encoding == "gzip":
+        body = prepared.gzip
+    else:
+        body = prepared.identity
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,103 @@
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+
+# Statuses worth another attempt; every other 4xx (bad params, auth, 404) is
+# permanent and retrying it only burns the ingest budget.
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Absolute time.monotonic() by which the current ingest must be finished.
+# Set once around the fan-out; asyncio tasks inherit it with their context.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("ingest_deadline", default=None)
+
+
+@contextmanager
+def deadline_budget(seconds: float):
+    """Bounds every upstream request made inside the block (and its tasks) to `seconds` in total."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current deadline budget, or None when unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Parses Retry-After as delta-seconds or an HTTP-date."""
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether and when async_get_json tries again.
+
+    Backoff uses decorrelated jitter (sleep = uniform(base, previous * 3), capped),
+    so retries from concurrent page walks spread out instead of arriving in
+    lockstep. A Retry-After header (429/503) overrides the jittered delay, up to
+    `max_retry_after`. No sleep is taken that would overrun the ingest deadline.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float, max_retry_after: float):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    @staticmethod
+    def is_retryable(exc: Exception) -> bool:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in RETRYABLE_STATUSES
+        # Timeouts, refused connections, dropped streams.
+        return isinstance(exc, httpx.TransportError)
+
+    def next_delay(self, previous: float, exc: Exception) -> float:
+        delay = min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+        if isinstance(exc, httpx.HTTPStatusError):
+            retry_after = _retry_after(exc.response)
+            if retry_after is not None:
+                delay = retry_after
+        return delay
+
+    def should_retry(self, attempt: int, exc: Exception, delay: float) -> bool:
+        if attempt >= self.max_attempts or not self.is_retryable(exc):
+            return False
+        if delay > self.max_retry_after:
+            return False
+        remaining = remaining_budget()
+        return remaining is None or delay < remaining
+
+
+def default_policy(retries: Optional[int] = None) -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=retries or settings.MAX_RETRIES,
+        base_delay=settings.RETRY_BASE_DELAY,
+        max_delay=settings.RETRY_MAX_DELAY,
+        max_retry_after=settings.RETRY_AFTER_MAX_SECONDS,
+    )
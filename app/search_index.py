@@ -0,0 +1,104 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.models import Job
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Fields searched by free-text `q`.
+TEXT_FIELDS = ("title", "company", "description", "location")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercases and splits text into word tokens."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """
+    Inverted index over one job snapshot.
+
+    Jobs are identified by their position in the snapshot list, so a result set
+    is a set of ints and a page is a slice of the sorted positions. Built once per
+    ingest; read-only afterwards.
+    """
+
+    def __init__(self, jobs: List[Job]):
+        self._size = len(jobs)
+        # token -> positions, across all TEXT_FIELDS (free-text search)
+        self._text: Dict[str, Set[int]] = {}
+        # token -> positions, restricted to one field (company/location filters)
+        self._company: Dict[str, Set[int]] = {}
+        self._location: Dict[str, Set[int]] = {}
+        # exact lowercase value -> positions (facets)
+        self._category: Dict[str, Set[int]] = {}
+        self._source: Dict[str, Set[int]] = {}
+        self._category_labels: Dict[str, str] = {}
+
+        for pos, job in enumerate(jobs):
+            for field in TEXT_FIELDS:
+                for token in tokenize(getattr(job, field)):
+                    self._text.setdefault(token, set()).add(pos)
+            for token in tokenize(job.company):
+                self._company.setdefault(token, set()).add(pos)
+            for token in tokenize(job.location):
+                self._location.setdefault(token, set()).add(pos)
+            label = job.jobCategory or ""
+            self._category_labels[label.lower()] = label
+            self._category.setdefault(label.lower(), set()).add(pos)
+            self._source.setdefault((job.source or "").lower(), set()).add(pos)
+
+    @staticmethod
+    def _match_tokens(postings: Dict[str, Set[int]], text: str) -> Set[int]:
+        """AND-matches every token of `text` against `postings`."""
+        sets = [postings.get(token, set()) for token in tokenize(text)]
+        if not sets:
+            return set()
+        # Intersect smallest-first so the working set shrinks as fast as possible.
+        sets.sort(key=len)
+        result = set(sets[0])
+        for s in sets[1:]:
+            result &= s
+            if not result:
+                break
+        return result
+
+    def search(
+        self,
+        q: Optional[str] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        company: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> List[int]:
+        """Returns the positions of matching jobs in snapshot order."""
+        constraints: List[Set[int]] = []
+        if q:
+            constraints.append(self._match_tokens(self._text, q))
+        if company:
+            constraints.append(self._match_tokens(self._company, company))
+        if location:
+            constraints.append(self._match_tokens(self._location, location))
+        if category:
+            constraints.append(self._category.get(category.lower(), set()))
+        if source:
+            constraints.append(self._source.get(source.lower(), set()))
+
+        if not constraints:
+            return list(range(self._size))
+        constraints.sort(key=len)
+        result = set(constraints[0])
+        for s in constraints[1:]:
+            result &= s
+        return sorted(result)
+
+    def category_counts(self, positions: Iterable[int]) -> Dict[str, int]:
+        """Counts `positions` per jobCategory (e.g. Remote / On-site KSA)."""
+        positions = set(positions)
+        return {
+            self._category_labels[name]: len(members & positions)
+            for name, members in self._category.items()
+            if name and members & positions
+        }
@@ -0,0 +1,147 @@
+import asyncio
+import fcntl
+import mmap
+import os
+import struct
+from typing import Callable, Dict, List, Optional
+
+import orjson
+
+from app.config import settings
+from app.job_store import job_store, JobSnapshot
+from app.models import Job
+from app.utils import logger
+
+
+# Header: magic, format version, snapshot version. Followers read only these
+# 16 bytes on each poll and map the body only when the snapshot version moved.
+_HEADER = struct.Struct("<4sIQ")
+_MAGIC = b"KSAJ"
+_FORMAT = 1
+
+
+def _write_file(path: str, version: int, body: bytes):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _FORMAT, version))
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    # Atomic swap: readers holding the old mapping keep the old inode.
+    os.replace(tmp, path)
+
+
+def _read_version(path: str) -> int:
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        return 0
+    if len(header) < _HEADER.size:
+        return 0
+    magic, fmt, version = _HEADER.unpack(header)
+    if magic != _MAGIC or fmt != _FORMAT:
+        return 0
+    return version
+
+
+def _read_file(path: str) -> tuple[List[Job], int]:
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, fmt, version = _HEADER.unpack_from(mm, 0)
+            if magic != _MAGIC or fmt != _FORMAT:
+                raise ValueError(f"{path} is not a shared snapshot file")
+            # Parse straight out of the mapping, no intermediate bytes copy.
+            with memoryview(mm) as view, view[_HEADER.size:] as body:
+                jobs = orjson.loads(body)
+    return [Job.from_dict(job) for job in jobs], version
+
+
+class SharedSnapshot:
+    """
+    Multi-worker coordination for `uvicorn --workers N`.
+
+    Every worker tries to take an exclusive, non-blocking flock on
+    INGEST_LOCK_PATH. The holder is the ingest leader: it runs the scheduler and
+    writes each published snapshot to SHARED_SNAPSHOT_PATH. The others poll the
+    file header and adopt a new snapshot only when its version changes. The lock
+    dies with its process, so a follower takes over if the leader exits.
+    """
+
+    def __init__(self, path: str, lock_path: str, poll_seconds: float):
+        self.path = path
+        self.lock_path = lock_path
+        self.poll_seconds = poll_seconds
+        self._lock_fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_fd is not None
+
+    def _try_acquire(self) -> bool:
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._lock_fd = fd
+        return True
+
+    async def publish(self, snapshot: JobSnapshot):
+        """Leader only: writes the snapshot for the followers to pick up."""
+        if not self.is_leader:
+            return
+        body = orjson.dumps(snapshot.jobs)
+        await asyncio.to_thread(_write_file, self.path, snapshot.version, body)
+        logger.info(f"shared_snapshot: wrote v{snapshot.version} ({len(body)} bytes) to {self.path}")
+
+    async def _reload_if_changed(self):
+        version = await asyncio.to_thread(_read_version, self.path)
+        if version <= job_store.snapshot.version:
+            return
+        jobs, version = await asyncio.to_thread(_read_file, self.path)
+        await job_store.publish(jobs, version=version)
+        self.reloads += 1
+
+    async def _follow(self, on_leader: Callable[[], None]):
+        while True:
+            try:
+                if self._try_acquire():
+                    logger.info(f"shared_snapshot: pid {os.getpid()} took over as ingest leader")
+                    on_leader()
+                    return
+                await self._reload_if_changed()
+            except Exception as e:
+                logger.exception(f"shared_snapshot: follower poll failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self, on_leader: Callable[[], None]):
+        """Elects this process leader (calls `on_leader`) or starts following the leader."""
+        if self._try_acquire():
+            logger.info(f"shared_snapshot: pid {os.getpid()} is the ingest leader")
+            on_leader()
+            return
+        logger.info(f"shared_snapshot: pid {os.getpid()} is a follower of {self.path}")
+        self._task = asyncio.create_task(self._follow(on_leader))
+
+    def stats(self) -> Dict:
+        return {
+            "role": "leader" if self.is_leader else "follower",
+            "pid": os.getpid(),
+            "reloads": self.reloads,
+        }
+
+
+shared_snapshot: Optional[SharedSnapshot] = (
+    SharedSnapshot(
+        settings.SHARED_SNAPSHOT_PATH,
+        settings.INGEST_LOCK_PATH,
+        settings.SHARED_SNAPSHOT_POLL_SECONDS,
+    )
+    if settings.SHARED_SNAPSHOT_PATH else None
+)
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight coroutine.
+
+    The first caller for a key starts the work; everyone arriving while it is
+    still running awaits the same future and receives the same result (or
+    exception). Once it settles, the next call starts a fresh run.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller giving up (e.g. client disconnect) does not cancel
+        # the shared run for everybody else.
+        return await asyncio.shield(future)
+
+    def in_flight(self, key: Hashable) -> Optional[asyncio.Future]:
+        """The run currently in flight for `key`, if any."""
+        return self._inflight.get(key)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
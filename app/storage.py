@@ -0,0 +1,110 @@
+import asyncio
+import sqlite3
+import time
+from typing import List, Optional, Tuple
+
+import orjson
+
+from app.config import settings, sqlite_path
+from app.models import Job
+from app.utils import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    dedup_key  TEXT PRIMARY KEY,
+    source     TEXT NOT NULL,
+    data       BLOB NOT NULL,
+    position   INTEGER NOT NULL,
+    active     INTEGER NOT NULL DEFAULT 1,
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_active_position ON jobs(active, position);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO jobs (dedup_key, source, data, position, active, first_seen, last_seen)
+VALUES (?, ?, ?, ?, 1, ?, ?)
+ON CONFLICT(dedup_key) DO UPDATE SET
+    source    = excluded.source,
+    data      = excluded.data,
+    position  = excluded.position,
+    active    = 1,
+    last_seen = excluded.last_seen
+"""
+
+
+class JobStorage:
+    """
+    Persists normalized jobs keyed by dedup_key in SQLite.
+
+    Each ingest is written as one transaction: a batched upsert of every job
+    (first_seen is kept, last_seen bumped) followed by marking jobs that did not
+    appear in this ingest inactive. Blocking sqlite calls run in a worker thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _save(self, jobs: List[Job], version: int) -> int:
+        now = time.time()
+        rows = [
+            (job.dedup_key, job.source, orjson.dumps(job), pos, now, now)
+            for pos, job in enumerate(jobs)
+        ]
+        conn = self._connect()
+        try:
+            with conn:  # single transaction, committed on exit
+                conn.executemany(_UPSERT, rows)
+                conn.execute("UPDATE jobs SET active = 0 WHERE active = 1 AND last_seen < ?", (now,))
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('version', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (str(version),),
+                )
+        finally:
+            conn.close()
+        return len(rows)
+
+    def _load(self, max_age: float) -> Tuple[List[Job], int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT data FROM jobs WHERE active = 1 AND last_seen >= ? ORDER BY position",
+                (time.time() - max_age,),
+            ).fetchall()
+            meta = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        finally:
+            conn.close()
+        return [Job.from_dict(orjson.loads(data)) for (data,) in rows], int(meta[0]) if meta else 0
+
+    async def save(self, jobs: List[Job], version: int):
+        start = time.monotonic()
+        count = await asyncio.to_thread(self._save, jobs, version)
+        logger.info(f"storage: persisted {count} jobs (v{version}) in {(time.monotonic() - start) * 1000:.2f} ms")
+
+    async def load(self, max_age: float) -> Tuple[List[Job], int]:
+        start = time.monotonic()
+        jobs, version = await asyncio.to_thread(self._load, max_age)
+        logger.info(f"storage: loaded {len(jobs)} jobs (v{version}) in {(time.monotonic() - start) * 1000:.2f} ms")
+        return jobs, version
+
+
+job_storage: Optional[JobStorage] = (
+    JobStorage(sqlite_path(settings.DATABASE_URL)) if settings.DATABASE_URL else None
+)
@@ -1,11 +1,15 @@
 import asyncio
-import orjson
 from loguru import logger
 from rich.console import Console
 from typing import Any, Optional
 import httpx
 from app.config import settings
+from app.http_pool import host_pool
+from app.http_cache import http_cache
+from app.offload import offloader
+from app.retry import RetryPolicy, default_policy, remaining_budget
 import sys
+import time
 
 
 console = Console()
@@ -36,17 +40,45 @@ logger.add("ksa_jobs.log", **file_log_config)
 logger.enable("app")  # Enable loguru for the 'app' module and its submodules
 
 
+class UpstreamError(Exception):
+    """Raised by async_get_json(raise_errors=True) once every attempt has failed."""
+
+
 # httpx AsyncClient singleton factory
 _async_client: Optional[httpx.AsyncClient] = None
 
 
+def _http2_available() -> bool:
+    if not settings.HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP2_ENABLED is set but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
 def get_httpx_client() -> httpx.AsyncClient:
     global _async_client
     if _async_client is None or _async_client.is_closed:
-        _async_client = httpx.AsyncClient(timeout=settings.TIMEOUT)
+        _async_client = httpx.AsyncClient(
+            timeout=settings.TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=_http2_available(),
+        )
     return _async_client
 
 
+def http_stats() -> dict:
+    """Per-host latency/slot usage plus connection pool occupancy."""
+    return host_pool.stats(_async_client)
+
+
 async def close_httpx_client():
     global _async_client
     if _async_client is not None and not _async_client.is_closed:
@@ -61,34 +93,91 @@ async def async_get_json(
     params: dict | None = None,
     headers: dict | None = None,
     json: dict | None = None,
-    retries: int | None = None
+    retries: int | None = None,
+    raise_errors: bool = False,
+    policy: RetryPolicy | None = None
 ) -> Any | None:
-    retries = retries or settings.MAX_RETRIES
+    """
+    Requests `url` and returns the decoded JSON body, retrying on failure.
+
+    Only transient failures (timeouts, connection errors, 408/425/429/5xx) are
+    retried, as decided by `policy`; a 400 or 404 fails on the first attempt.
+    Inside a deadline_budget() block each attempt is cut off when the budget
+    runs out.
+
+    GETs are sent conditionally when an earlier response carried an ETag or
+    Last-Modified; a 304 returns the previously decoded body without parsing.
+
+    On final failure returns None, or raises UpstreamError when `raise_errors`
+    is set so callers can tell "upstream down" apart from "no data".
+    """
+    policy = policy or default_policy(retries)
     client = get_httpx_client()
+    host = host_pool.host(url)
+    cache_key = None
+    cached = None
+    if settings.HTTP_CACHE_ENABLED and method.upper() == 'GET':
+        cache_key = http_cache.key(method, url, params, json)
+        try:
+            cached = await http_cache.lookup(cache_key)
+        except Exception as e:
+            logger.warning(f"async_get_json: http cache lookup failed for {url}: {e}")
+    request_headers = http_cache.conditional_headers(cached, headers)
     last_exc = None
-    for attempt in range(1, retries + 1):
+    attempt = 0
+    delay = policy.base_delay
+    while True:
+        attempt += 1
         try:
-            if method.upper() == 'POST':
-                resp = await client.post(url, params=params, headers=headers, json=json)
-            else:
-                resp = await client.get(url, params=params, headers=headers)
-
+            # The whole attempt, waiting for a host slot included, has to fit
+            # in what is left of the ingest budget (None: unbounded).
+            async with asyncio.timeout(remaining_budget()):
+                # Per-host slot: waits here rather than taking a pooled connection
+                # away from other hosts. The read timeout tracks this host's p95.
+                async with host.slot():
+                    start = time.monotonic()
+                    try:
+                        if method.upper() == 'POST':
+                            resp = await client.post(url, params=params, headers=request_headers, json=json, timeout=host.timeout())
+                        else:
+                            resp = await client.get(url, params=params, headers=request_headers, timeout=host.timeout())
+                    except httpx.TimeoutException:
+                        host.timeouts += 1
+                        raise
+                    except httpx.HTTPError:
+                        host.errors += 1
+                        raise
+                    host.observe(time.monotonic() - start)
+
+            if resp.status_code == 304 and cached is not None:
+                return http_cache.not_modified(cached)
             resp.raise_for_status()
             try:
-                return orjson.loads(resp.content)
+                value = await offloader.parse_json(resp.content)
             except Exception:
-                return resp.json()
-        except httpx.HTTPStatusError as e:  # Catch specific HTTP status errors
+                value = resp.json()
+            if cache_key is not None:
+                try:
+                    await http_cache.store(cache_key, resp, value)
+                except Exception as e:
+                    logger.warning(f"async_get_json: http cache store failed for {url}: {e}")
+            return value
+        except TimeoutError as e:
             last_exc = e
-            logger.warning(
-                f"async_get_json (method: {method}) attempt {attempt} failed for {url} with status {e.response.status_code}: {e}"
-            )
-            await asyncio.sleep(min(2 ** attempt, 8))
-        except Exception as e:  # Catch other exceptions
+            logger.warning(f"async_get_json (method: {method}) attempt {attempt} for {url} cut off: ingest deadline reached")
+            break
+        except Exception as e:
             last_exc = e
+            status = f" with status {e.response.status_code}" if isinstance(e, httpx.HTTPStatusError) else ""
+            delay = policy.next_delay(delay, e)
+            if not policy.should_retry(attempt, e, delay):
+                logger.warning(f"async_get_json (method: {method}) attempt {attempt} failed for {url}{status}: {e}")
+                break
             logger.warning(
-                f"async_get_json (method: {method}) attempt {attempt} failed for {url}: {e}"
+                f"async_get_json (method: {method}) attempt {attempt} failed for {url}{status}: {e}; retrying in {delay:.2f}s"
             )
-            await asyncio.sleep(min(2 ** attempt, 8))
-    logger.error(f"async_get_json (method: {method}) all attempts failed for {url}: {last_exc}")
+            await asyncio.sleep(delay)
+    logger.error(f"async_get_json (method: {method}) giving up on {url} after {attempt} attempt(s): {last_exc}")
+    if raise_errors:
+        raise UpstreamError(f"{method} {url} failed after {attempt} attempt(s): {last_exc}") from last_exc
     return None
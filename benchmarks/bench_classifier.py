@@ -0,0 +1,53 @@
+"""
+Batch classifier vs. the per-job filter functions on a synthetic corpus.
+
+    python -m benchmarks.bench_classifier [n_jobs]
+
+"before" is the old ingest path: filter_ksa_remote (both classifiers) and then
+the re-classification inside normalize_job. "after" is one classify_job call per job.
+"""
+import sys
+import time
+
+from app.filters import classify_job, filter_ksa_remote, is_ksa_on_site_job, is_truly_remote_job
+from benchmarks.synthetic import make_corpus
+
+
+def per_job(raw_jobs):
+    labels = []
+    for raw in raw_jobs:
+        if not filter_ksa_remote(raw):
+            labels.append("")
+        elif is_truly_remote_job(raw):
+            labels.append("Remote")
+        elif is_ksa_on_site_job(raw):
+            labels.append("On-site KSA")
+        else:
+            labels.append("")
+    return labels
+
+
+def classify_jobs(raw_jobs):
+    return [classify_job(raw) for raw in raw_jobs]
+
+
+def main(n: int):
+    corpus = make_corpus(n)
+
+    start = time.perf_counter()
+    before = per_job(corpus)
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = classify_jobs(corpus)
+    after_s = time.perf_counter() - start
+
+    assert before == after, "batch classifier disagrees with the per-job functions"
+    print(f"jobs:            {n}")
+    print(f"per-job filters: {before_s:.3f}s ({before_s / n * 1e6:.1f} us/job)")
+    print(f"classify_jobs:   {after_s:.3f}s ({after_s / n * 1e6:.1f} us/job)")
+    print(f"speedup:         {before_s / after_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,89 @@
+"""
+Near-duplicate collapse (MinHash + LSH) on a synthetic corpus with planted
+cross-source reposts: same role, different URL, trivially varied title and
+re-formatted description.
+
+    python -m benchmarks.bench_dedup [n_jobs] [duplicate_fraction]
+"""
+import random
+import sys
+import time
+from dataclasses import replace
+
+from app.dedup import collapse_near_duplicates
+from app.models import Job
+from app.normalizer import filter_and_normalize
+from benchmarks.synthetic import make_corpus
+
+# The shared synthetic corpus has 10 companies and ~30 description words, far
+# less varied than real postings; spread jobs over more employers and give each
+# a description drawn from a Zipf-weighted vocabulary.
+COMPANIES = [f"Company {i}" for i in range(5_000)]
+VOCAB = [f"w{i}" for i in range(20_000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCAB))]
+
+TITLE_VARIANTS = [
+    lambda t: t.replace("Senior", "Sr.").replace("Junior", "Jr."),
+    lambda t: f"{t} (Remote)",
+    lambda t: f"{t} (m/w/d)",
+    lambda t: t.upper(),
+]
+
+
+def repost(rng: random.Random, job: Job, i: int) -> Job:
+    words = job.description.split()
+    if words:
+        words[rng.randrange(len(words))] = "exciting"  # one-word edit
+    return replace(
+        job,
+        source="jobicy",
+        url=f"https://jobicy.example.com/{i}",
+        title=rng.choice(TITLE_VARIANTS)(job.title),
+        company=f"{job.company}, Inc.",
+        description="<p>" + " ".join(words) + "</p>",
+    )
+
+
+def main(n: int, fraction: float):
+    originals = []
+    seed = 0
+    while len(originals) < n:
+        originals.extend(Job.from_dict(job) for job in filter_and_normalize(make_corpus(n, seed=seed), "remotive"))
+        seed += 1
+    rng = random.Random(7)
+    originals = [
+        replace(job, url=f"https://remotive.example.com/{i}", company=rng.choice(COMPANIES),
+                description=" ".join(rng.choices(VOCAB, WEIGHTS, k=rng.randint(60, 200))) if job.description else "")
+        for i, job in enumerate(originals[:n])
+    ]
+
+    planted = int(n * fraction)
+    copies = [repost(rng, originals[i], i) for i in rng.sample(range(n), planted)]
+    jobs = originals + copies
+
+    start = time.perf_counter()
+    kept, folded = collapse_near_duplicates(jobs)
+    elapsed = time.perf_counter() - start
+
+    kept_copies = sum(1 for job in kept if job.source == "jobicy")
+    detectable = sum(1 for job in copies if job.description != "<p></p>")
+    kept_originals = sum(1 for job in kept if job.source == "remotive")
+    print(f"jobs:           {len(jobs)} ({n} originals, {planted} planted reposts)")
+    # Next hourly run: the incremental ingest hands back the same Job objects
+    start = time.perf_counter()
+    assert collapse_near_duplicates(jobs) == (kept, folded)
+    rerun = time.perf_counter() - start
+
+    print(f"collapse:       {elapsed:.3f}s ({elapsed / len(jobs) * 1e6:.1f} us/job)")
+    print(f"re-run:         {rerun:.3f}s (signatures of unchanged jobs reused)")
+    print(f"folded:         {folded}")
+    print(f"recall:         {(planted - kept_copies) / detectable:.3f} of {detectable} reposts with a description "
+          f"(the rest are left to exact dedup)")
+    print(f"false merges:   {n - kept_originals} originals folded into another original")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.1,
+    )
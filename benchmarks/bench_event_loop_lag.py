@@ -0,0 +1,75 @@
+"""
+Event-loop lag during an ingest, per INGEST_EXECUTOR mode: how late a 10 ms
+timer fires (what a /health request waiting on the loop would see) while
+pages are parsed and filtered/normalized.
+
+    python -m benchmarks.bench_event_loop_lag [n_jobs] [page_size] [workers]
+"""
+import asyncio
+import math
+import statistics
+import sys
+import time
+
+import orjson
+
+from app import job_service
+from app.offload import INLINE, MODES, Offloader
+from benchmarks.synthetic import make_corpus
+
+PROBE_INTERVAL = 0.01
+
+
+async def probe(stop: asyncio.Event, lags: list):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((loop.time() - start - PROBE_INTERVAL) * 1000)
+
+
+async def ingest(offloader: Offloader, payloads: list):
+    for payload in payloads:
+        raw = await offloader.parse_json(payload)
+        if offloader.mode == INLINE:
+            job_service._normalize_page("remotive", raw, {})
+        else:
+            await job_service._normalize_page_offloaded("remotive", raw, {})
+
+
+async def bench(mode: str, payloads: list, workers: int):
+    offloader = job_service.offloader = Offloader(mode, workers)
+    # Warm the pool (process workers import the app) outside the measurement
+    await offloader.run(len, [])
+
+    stop = asyncio.Event()
+    lags: list = []
+    prober = asyncio.create_task(probe(stop, lags))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+    start = time.perf_counter()
+    await ingest(offloader, payloads)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await prober
+    offloader.shutdown()
+
+    lags.sort()
+    p99 = lags[math.ceil(len(lags) * 0.99) - 1]
+    print(f"{mode:>8} | ingest {elapsed:6.2f}s | loop lag p50 {statistics.median(lags):7.1f} ms "
+          f"p99 {p99:7.1f} ms max {lags[-1]:7.1f} ms")
+
+
+def main(n: int, page_size: int, workers: int):
+    corpus = make_corpus(n)
+    payloads = [orjson.dumps(corpus[i:i + page_size]) for i in range(0, n, page_size)]
+    print(f"{n} items in {len(payloads)} page(s) of {len(payloads[0]) / 1e6:.1f} MB, {workers} worker(s)")
+    for mode in MODES:
+        asyncio.run(bench(mode, payloads, workers))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 2,
+    )
@@ -0,0 +1,47 @@
+"""
+Incremental re-ingest (content_hash + reuse) vs. re-running filter_and_normalize
+on every item, for a feed where a small share of items changed since last hour.
+
+    python -m benchmarks.bench_incremental [n_jobs] [changed_fraction]
+"""
+import random
+import sys
+import time
+
+from app.job_service import _normalize_page
+from app.models import Job
+from app.normalizer import filter_and_normalize
+from benchmarks.synthetic import make_corpus
+
+
+def main(n: int, changed: float):
+    corpus = make_corpus(n)
+    _, memo, _ = _normalize_page("remotive", corpus, {})
+
+    rng = random.Random(1)
+    next_hour = [dict(item) for item in corpus]
+    for i in rng.sample(range(n), int(n * changed)):
+        item = next_hour[i]
+        key = "description" if "description" in item else "jobDescription"
+        item[key] = (item.get(key) or "") + " updated"
+
+    start = time.perf_counter()
+    full = [Job.from_dict(job) for job in filter_and_normalize(next_hour, "remotive")]
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    incremental, _, reused = _normalize_page("remotive", next_hour, memo)
+    incremental_s = time.perf_counter() - start
+
+    assert full == incremental, "incremental output differs from a full pass"
+    print(f"jobs:                {n} ({len(full)} kept, {reused} unchanged items reused)")
+    print(f"full re-normalize:   {full_s:.3f}s ({full_s / n * 1e6:.1f} us/item)")
+    print(f"incremental:         {incremental_s:.3f}s ({incremental_s / n * 1e6:.1f} us/item)")
+    print(f"speedup:             {full_s / incremental_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.05,
+    )
@@ -0,0 +1,62 @@
+"""
+Resident memory of 100k normalized jobs held as dicts vs. as Job records.
+
+    python -m benchmarks.bench_memory [n_jobs]
+
+Each variant runs in a fresh interpreter. The normalized jobs are prepared as
+orjson-encoded bytes first and decoded one at a time (as an ingest would), so the
+measured RSS delta is only the in-memory representation.
+"""
+import subprocess
+import sys
+
+CHILD = r"""
+import gc, sys
+import orjson
+from app.models import Job
+from app.normalizer import filter_and_normalize
+from benchmarks.synthetic import make_corpus
+
+n, variant = int(sys.argv[1]), sys.argv[2]
+jobs = []
+seed = 0
+while len(jobs) < n:
+    jobs.extend(filter_and_normalize(make_corpus(n, seed=seed), "remotive"))
+    seed += 1
+blobs = [orjson.dumps(job) for job in jobs[:n]]
+del jobs
+gc.collect()
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+before = rss_kb()
+if variant == "dict":
+    held = [orjson.loads(b) for b in blobs]
+else:
+    held = [Job.from_dict(orjson.loads(b)) for b in blobs]
+gc.collect()
+print(rss_kb() - before)
+"""
+
+
+def measure(n: int, variant: str) -> int:
+    out = subprocess.run([sys.executable, "-c", CHILD, str(n), variant],
+                         capture_output=True, text=True, check=True)
+    return int(out.stdout.strip().splitlines()[-1])
+
+
+def main(n: int):
+    dict_kb = measure(n, "dict")
+    job_kb = measure(n, "job")
+    print(f"jobs:       {n}")
+    print(f"dict form:  {dict_kb / 1024:.1f} MiB ({dict_kb * 1024 / n:.0f} B/job)")
+    print(f"Job form:   {job_kb / 1024:.1f} MiB ({job_kb * 1024 / n:.0f} B/job)")
+    print(f"saved:      {(1 - job_kb / dict_kb) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
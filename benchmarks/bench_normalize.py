@@ -0,0 +1,62 @@
+"""
+Fused filter_and_normalize vs. the old filter_ksa_remote + normalize_job loop.
+
+    python -m benchmarks.bench_normalize [n_jobs]
+"""
+import sys
+import time
+
+from app.filters import filter_ksa_remote
+from app.normalizer import filter_and_normalize, normalize_job
+from benchmarks.synthetic import make_corpus
+
+
+def old_path(raw_items, source):
+    kept = []
+    for item in raw_items:
+        try:
+            if filter_ksa_remote(item):
+                kept.append(normalize_job(item, source))
+        except Exception:
+            pass
+    return kept
+
+
+def main(n: int):
+    corpus = make_corpus(n)
+
+    start = time.perf_counter()
+    before = old_path(corpus, "remotive")
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = filter_and_normalize(corpus, "remotive")
+    after_s = time.perf_counter() - start
+
+    assert before == after, "fused stage output differs from normalize_job"
+    adzuna = [
+        {"title": item.get("title") or item.get("jobTitle"),
+         "company": {"display_name": " Adzuna Co "},
+         "location": {"display_name": item.get("location") or item.get("jobGeo") or "Riyadh"},
+         "redirect_url": f"https://adzuna.example.com/{i}",
+         "description": item.get("description") or item.get("jobDescription")}
+        for i, item in enumerate(corpus[:2000])
+    ]
+    assert old_path(adzuna, "adzuna") == filter_and_normalize(adzuna, "adzuna")
+    # The synthetic corpus never splits a keyword over two fields; these do.
+    split = [
+        {"title": "Lead for work", "company_name": "Acme", "location": "Berlin",
+         "description": "from home, then relocation", "url": "https://split.example.com/1"},
+        {"title": "Engineer", "company_name": "Acme", "location": "Berlin, work", "job_type": "from home",
+         "url": "https://split.example.com/2"},
+    ]
+    assert old_path(split, "remotive") == filter_and_normalize(split, "remotive") == []
+
+    print(f"jobs:                   {n} ({len(after)} kept)")
+    print(f"filter + normalize_job: {before_s:.3f}s ({before_s / n * 1e6:.1f} us/item)")
+    print(f"filter_and_normalize:   {after_s:.3f}s ({after_s / n * 1e6:.1f} us/item)")
+    print(f"speedup:                {before_s / after_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
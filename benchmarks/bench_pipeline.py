@@ -0,0 +1,60 @@
+"""
+Peak memory of one paginated source load when upstream pages arrive faster
+than they are normalized: the bounded ingest pipeline (INGEST_QUEUE_SIZE) vs.
+effectively unbounded queues, where every raw page is buffered at once.
+
+    python -m benchmarks.bench_pipeline [n_pages] [page_size]
+
+Peaks are traced Python allocations (tracemalloc) above the starting point,
+so they include the kept Job records, which are the same in both runs.
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+import orjson
+
+from app import job_service
+from app.config import settings
+from app.pipeline import pipeline_stats
+from benchmarks.synthetic import make_corpus
+
+
+def run(blobs: list, queue_size: int):
+    settings.INGEST_QUEUE_SIZE = queue_size
+    job_service._item_memo.clear()
+    job_service._page_memo.clear()
+
+    async def pages():
+        # A fast upstream: each page is decoded as soon as it is asked for.
+        for blob in blobs:
+            yield orjson.loads(blob)
+            await asyncio.sleep(0)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    jobs = asyncio.run(job_service._load_client("remotive", pages))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"queue size {queue_size:>7} | {len(jobs)} jobs in {elapsed:5.2f}s | peak {peak / 2**20:7.1f} MiB")
+
+
+def main(n_pages: int, page_size: int):
+    settings.INGEST_EXECUTOR = "inline"
+    corpus = make_corpus(n_pages * page_size)
+    blobs = [orjson.dumps(corpus[i:i + page_size]) for i in range(0, len(corpus), page_size)]
+    del corpus
+    print(f"{n_pages} pages of {page_size} items ({len(blobs[0]) / 2**20:.1f} MiB each), "
+          f"{settings.INGEST_NORMALIZE_WORKERS} normalize worker(s)")
+    run(blobs, 10**6)
+    run(blobs, 4)
+    print(orjson.dumps(pipeline_stats(), option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 40,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+    )
@@ -0,0 +1,69 @@
+"""
+BM25 ranking: index build time and /jobs/?query= ranking latency.
+
+    python -m benchmarks.bench_ranking [n_jobs ...]     (default: 10000 100000 1000000)
+
+Build is measured cold (every job tokenized) and warm (a re-publish where the
+incremental ingest hands back the same Job objects).
+"""
+import statistics
+import sys
+import time
+
+from app import ranking
+from app.models import Job
+from app.normalizer import filter_and_normalize
+from benchmarks.synthetic import make_corpus
+
+QUERIES = [
+    "react developer riyadh",
+    "senior backend engineer",
+    "python aws kubernetes",
+    "data scientist",
+    "devops remote",
+    "machine learning engineer jeddah",
+    "product manager",
+    "hooli",
+]
+TOP_K = 500
+
+
+def make_jobs(n: int):
+    jobs = []
+    seed = 0
+    while len(jobs) < n:
+        jobs.extend(Job.from_dict(job) for job in filter_and_normalize(make_corpus(min(n, 200_000), seed=seed), "remotive"))
+        seed += 1
+    return jobs[:n]
+
+
+def bench(jobs):
+    ranking._analysis_memo = {}
+    start = time.perf_counter()
+    index = ranking.BM25Index(jobs)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = ranking.BM25Index(jobs)
+    warm = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(5):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.top_k(query, TOP_K)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{len(jobs):>9} jobs | build cold {cold:7.2f}s warm {warm:6.2f}s | "
+          f"query p50 {statistics.median(latencies):7.2f} ms p95 {p95:7.2f} ms")
+
+
+def main(sizes):
+    jobs = make_jobs(max(sizes))
+    for n in sorted(sizes):
+        bench(jobs[:n])
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,47 @@
+"""Synthetic raw job payloads shaped like the upstream APIs, for benchmarks."""
+import random
+from typing import Dict, List
+
+TITLES = ["Software Engineer", "Backend Developer", "React Developer", "Data Scientist",
+          "DevOps Engineer", "Product Manager", "QA Analyst", "Mobile Developer",
+          "Machine Learning Engineer", "Site Reliability Engineer"]
+SENIORITY = ["", "Senior ", "Junior ", "Lead ", "Staff "]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries",
+             "Wayne Enterprises", "Tabuk Tech", "Riyadh Soft", "Gulf Systems"]
+LOCATIONS = ["Riyadh, Saudi Arabia", "Jeddah", "Berlin, Germany", "Worldwide", "Remote",
+             "Dubai, UAE", "London", "Middle East", "Anywhere", "Arkansas, USA", "Khobar"]
+JOB_TYPES = ["full_time", "contract", "Full-time", "part_time", "remote"]
+WORDS = ("we are hiring a motivated engineer to build scalable systems with python react aws "
+         "kubernetes docker postgres and work closely with product design and data teams").split()
+
+
+def _description(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+
+
+def make_raw_job(rng: random.Random, i: int) -> Dict:
+    """One raw job using one of the upstream field layouts (Remotive, Jobicy, ArbeitNow, Jooble)."""
+    title = rng.choice(SENIORITY) + rng.choice(TITLES)
+    company = rng.choice(COMPANIES)
+    location = rng.choice(LOCATIONS)
+    url = f"https://jobs.example.com/{i}"
+    layout = i % 4
+    if layout == 0:  # Remotive
+        return {"title": title, "company_name": company, "url": url, "description": _description(rng),
+                "job_type": rng.choice(JOB_TYPES), "candidate_required_location": location,
+                "publication_date": "2025-01-01T00:00:00"}
+    if layout == 1:  # Jobicy
+        return {"jobTitle": title, "companyName": company, "jobUrl": url, "jobDescription": _description(rng),
+                "jobType": rng.choice(JOB_TYPES), "jobGeo": location, "jobIndustry": "Engineering",
+                "pubDate": "2025-01-01 00:00:00"}
+    if layout == 2:  # ArbeitNow
+        return {"title": title, "company_name": company, "url": url, "description": _description(rng),
+                "remote": rng.random() < 0.3, "location": location, "job_types": ["full time"],
+                "created_at": 1735689600}
+    return {"title": title, "company": company, "link": url, "snippet": _description(rng),  # Jooble
+            "type": rng.choice(JOB_TYPES), "location": location, "updated": "2025-01-01T00:00:00"}
+
+
+def make_corpus(n: int, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    return [make_raw_job(rng, i) for i in range(n)]
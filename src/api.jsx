@@ -2,10 +2,16 @@ import axios from "axios";
 
 const API_BASE = import.meta.env.VITE_API_URL || "";
 
-export async function fetchJobs(keyword, signal) { // Added signal parameter
+export async function fetchJobs(keyword, signal, { category, page = 1 } = {}) { // Added signal parameter
   try {
-    // Pass the keyword as 'query' param if it exists
-    const params = keyword ? { query: keyword } : {};
+    // The search box goes out as `query`, the backend's relevance search: the AI
+    // service ranks it when configured, BM25 otherwise (best matches first, so
+    // typos and partial matches still find jobs). `q` is the other search param,
+    // a strict filter that keeps only jobs containing every word; the box does
+    // not use it. Filtering and paging happen server-side.
+    const params = { page };
+    if (keyword) params.query = keyword;
+    if (category) params.category = category;
     
     const res = await axios.get(`${API_BASE}/jobs/`, {
       params,
@@ -14,7 +20,7 @@ export async function fetchJobs(keyword, signal) { // Added signal parameter
     });
 
     // The backend now returns a consistent shape with an 'ai_powered' flag
-    return res.data || { jobs: [], stats: {}, ai_powered: false };
+    return res.data || { jobs: [], total: 0, stats: {}, ai_powered: false };
 
   } catch (err) {
     // If the request was cancelled, do not log an error
@@ -24,7 +30,7 @@ export async function fetchJobs(keyword, signal) { // Added signal parameter
       console.error("fetchJobs error:", err);
     }
     // Return a response shape consistent with the success case
-    return { jobs: [], stats: {}, ai_powered: false };
+    return { jobs: [], total: 0, stats: {}, ai_powered: false };
   }
 }
 
@@ -1,4 +1,4 @@
-import React, { useEffect, useState, useMemo, useRef } from "react";
+import React, { useEffect, useState, useRef } from "react";
 import SearchFilter from "./components/SearchFilter.jsx";
 import JobList from "./components/JobList.jsx";
 import SkeletonJobList from "./components/SkeletonJobList.jsx";
@@ -18,70 +18,49 @@ function useDebounce(value, delay) {
 }
 
 export default function App() {
-  const [masterJobList, setMasterJobList] = useState([]);
   const [displayJobs, setDisplayJobs] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [page, setPage] = useState(1);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [isAiPowered, setIsAiPowered] = useState(false);
   const [keyword, setKeyword] = useState("");
   const [jobTypeFilter, setJobTypeFilter] = useState("On-site KSA");
   const debouncedKeyword = useDebounce(keyword, 500);
   const searchIdRef = useRef(0);
 
-  async function loadInitialJobs() {
-    console.log("LOG: Initializing - fetching master job list.");
-    setLoading(true);
-    try {
-      const res = await fetchJobs();
-      setMasterJobList(res.jobs || []);
-      setDisplayJobs(res.jobs || []);
-      setIsAiPowered(false);
-      console.log(`LOG: Master job list loaded with ${res.jobs?.length || 0} jobs.`);
-    } catch (error) {
-      console.error("Error loading initial jobs:", error);
-      setMasterJobList([]);
-      setDisplayJobs([]);
-    } finally {
-      setLoading(false);
-    }
-  }
-
-  useEffect(() => {
-    loadInitialJobs();
-  }, []);
-
+  // Filtering and pagination happen server-side: every keyword or job type change
+  // fetches page 1, "Load more" appends the following pages.
   useEffect(() => {
     const controller = new AbortController();
     searchIdRef.current += 1;
     const currentSearchId = searchIdRef.current;
 
     const performSearch = async () => {
-      if (debouncedKeyword) {
-        console.log(`LOG: Debounced search triggered for keyword: '${debouncedKeyword}'`);
-        setLoading(true);
-        try {
-          const res = await fetchJobs(debouncedKeyword, controller.signal);
-          if (currentSearchId === searchIdRef.current) {
-            setDisplayJobs(res.jobs || []);
-            setIsAiPowered(res.ai_powered);
-            console.log(`LOG: Search complete. AI powered: ${res.ai_powered}. Found ${res.jobs?.length} jobs.`);
-          } else {
-            console.log("LOG: Stale search result ignored.");
-          }
-        } catch (error) {
-          if (error.name === 'CanceledError') {
-            console.log("LOG: Fetch aborted:", error.message);
-          } else {
-            console.error("Error during search:", error);
-            setDisplayJobs(masterJobList);
-            setIsAiPowered(false);
-          }
-        } finally {
-          setLoading(false);
+      console.log(`LOG: Fetching page 1 for keyword: '${debouncedKeyword}', job type: '${jobTypeFilter}'`);
+      setLoading(true);
+      try {
+        const res = await fetchJobs(debouncedKeyword, controller.signal, { category: jobTypeFilter, page: 1 });
+        if (currentSearchId === searchIdRef.current) {
+          setDisplayJobs(res.jobs || []);
+          setTotal(res.total ?? res.jobs?.length ?? 0);
+          setPage(1);
+          setIsAiPowered(res.ai_powered);
+          console.log(`LOG: Search complete. AI powered: ${res.ai_powered}. Showing ${res.jobs?.length} of ${res.total} jobs.`);
+        } else {
+          console.log("LOG: Stale search result ignored.");
         }
-      } else {
-        console.log("LOG: Search box cleared. Resetting to master list (no network call).");
-        setDisplayJobs(masterJobList);
-        setIsAiPowered(false);
+      } catch (error) {
+        if (error.name === 'CanceledError') {
+          console.log("LOG: Fetch aborted:", error.message);
+        } else {
+          console.error("Error during search:", error);
+          setDisplayJobs([]);
+          setTotal(0);
+          setIsAiPowered(false);
+        }
+      } finally {
+        setLoading(false);
       }
     };
 
@@ -92,19 +71,25 @@ export default function App() {
       controller.abort();
     };
 
-  }, [debouncedKeyword, masterJobList]);
+  }, [debouncedKeyword, jobTypeFilter]);
 
-  const finalFilteredJobs = useMemo(() => {
-    if (isAiPowered) {
-        return displayJobs;
+  async function loadMore() {
+    const nextPage = page + 1;
+    const currentSearchId = searchIdRef.current;
+    setLoadingMore(true);
+    try {
+      const res = await fetchJobs(debouncedKeyword, undefined, { category: jobTypeFilter, page: nextPage });
+      if (currentSearchId === searchIdRef.current) {
+        setDisplayJobs(prev => [...prev, ...(res.jobs || [])]);
+        setPage(nextPage);
+      }
+    } finally {
+      setLoadingMore(false);
     }
+  }
 
-    console.log("LOG: Applying client-side filters (Job Type) for fallback mode.");
-    return displayJobs.filter(job => {
-      const jobTypeMatch = !jobTypeFilter || (job.jobCategory === jobTypeFilter);
-      return jobTypeMatch;
-    });
-  }, [displayJobs, jobTypeFilter, isAiPowered]);
+  const finalFilteredJobs = displayJobs;
+  const hasMore = !isAiPowered && displayJobs.length < total;
 
   return (
     <div className="relative flex flex-col min-h-screen overflow-hidden">
@@ -124,7 +109,16 @@ export default function App() {
                 No jobs found matching your criteria.
               </div>
             ) : (
-              <JobList jobs={finalFilteredJobs} />
+              <>
+                <JobList jobs={finalFilteredJobs} />
+                {hasMore && (
+                  <div className="text-center mt-6">
+                    <button type="button" onClick={loadMore} disabled={loadingMore}>
+                      {loadingMore ? "Loading..." : `Load more (${displayJobs.length} of ${total})`}
+                    </button>
+                  </div>
+                )}
+              </>
             )}
           </div>
         </div>
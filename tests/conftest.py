@@ -0,0 +1,66 @@
+import os
+
+# No on-disk job store / HTTP cache while testing; must be set before app.config is imported.
+os.environ["DATABASE_URL"] = ""
+
+import httpx
+import pytest
+
+from app import job_service, utils
+from app.circuit_breaker import source_breakers
+from app.config import settings
+from app.http_cache import http_cache
+from app.http_pool import host_pool
+from app.models import Job
+
+
+@pytest.fixture(autouse=True)
+def fresh_ingest_state(monkeypatch):
+    """Every test starts with empty caches, breakers and per-host budgets."""
+    job_service.source_cache._entries.clear()
+    job_service._item_memo.clear()
+    job_service._page_memo.clear()
+    source_breakers._breakers.clear()
+    http_cache._entries.clear()
+    host_pool._hosts.clear()
+    # Keep retry backoff in the milliseconds.
+    monkeypatch.setattr(settings, "RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(settings, "RETRY_MAX_DELAY", 0.02)
+    yield
+    utils._async_client = None
+
+
+@pytest.fixture
+def upstream():
+    """
+    Installs an httpx.MockTransport handler as the shared client's transport:
+    upstream(handler) routes every request async_get_json sends to `handler`.
+    """
+    def install(handler):
+        utils._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    return install
+
+
+@pytest.fixture
+def make_job():
+    """Job factory: make_job("t1", jobCategory="Remote") with placeholder values for the rest."""
+    def make(title: str, **fields) -> Job:
+        values = {
+            "source": "remotive",
+            "title": title,
+            "company": "Acme",
+            "url": f"https://jobs.test/{title}",
+            "description": "",
+            "jobType": "Full-time",
+            "jobIndustry": "Software",
+            "location": "Riyadh",
+            "remote": True,
+            "pubDate": "2024-01-01",
+            "jobCategory": "Remote",
+            "dedup_key": title,
+        }
+        values.update(fields)
+        return Job.from_dict(values)
+
+    return make
@@ -0,0 +1,31 @@
+import asyncio
+
+import httpx
+import orjson
+
+from app import api_clients
+from app.cache import LRUCache
+from app.config import settings
+
+
+def test_ai_service_gets_the_query_as_typed(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "AI_SERVICE_URL", "https://ai.test")
+    monkeypatch.setattr(api_clients, "ai_search_cache", LRUCache(16))
+    sent = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(orjson.loads(request.content))
+        return httpx.Response(200, json={"results": []})
+
+    upstream(handler)
+
+    async def main():
+        first = await api_clients.cached_ai_search_results("Senior React  Riyadh", 1)
+        second = await api_clients.cached_ai_search_results("riyadh react senior", 1)
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert [body["query"] for body in sent] == ["Senior React  Riyadh"]
+    # The reordered query is answered from the normalized cache entry.
+    assert second is first
@@ -0,0 +1,57 @@
+import asyncio
+
+from app import jobs_router
+from app.analytics import AnalyticsEngine
+from app.job_store import JobStore
+
+
+def test_stats_filters_match_case_insensitively(make_job):
+    engine = AnalyticsEngine()
+    engine.reset([
+        make_job("a", jobCategory="Remote", source="remotive"),
+        make_job("b", jobCategory="Remote", source="jobicy"),
+        make_job("c", jobCategory="On-site KSA", source="jooble"),
+    ])
+
+    assert engine.stats(category="remote")["total_jobs"] == 2
+    assert engine.stats(category="REMOTE", source="Remotive")["total_jobs"] == 1
+    assert engine.stats(category="on-site ksa")["total_jobs"] == 1
+    assert engine.stats(source="JOOBLE")["jobs_per_category"] == {"On-site KSA": 1}
+
+
+def test_incremental_updates_land_in_the_same_tabs(make_job):
+    engine = AnalyticsEngine()
+    old = {"a": make_job("a", jobCategory="Remote")}
+    engine.reset(list(old.values()))
+    new = {"a": make_job("a", jobCategory="remote"), "b": make_job("b", jobCategory="REMOTE")}
+
+    engine.update(old, new)
+
+    assert engine.stats(category="Remote")["total_jobs"] == 2
+    engine.update(new, {})
+    assert engine.stats()["total_jobs"] == 0
+
+
+def test_stats_endpoint_category_is_case_insensitive(make_job, monkeypatch):
+    store = JobStore()
+    asyncio.run(store.publish([make_job("a", jobCategory="Remote"), make_job("b", jobCategory="On-site KSA")]))
+    monkeypatch.setattr(jobs_router, "job_store", store)
+
+    stats = asyncio.run(jobs_router.get_job_stats(category="remote", source=None, top=50))
+
+    assert stats["total_jobs"] == 1
+    assert stats["jobs_per_category"] == {"Remote": 1}
+
+
+def test_top_ranks_by_count_after_updates(make_job):
+    engine = AnalyticsEngine()
+    jobs = {f"{company}{i}": make_job(f"{company}{i}", company=company)
+            for company, n in (("a", 5), ("b", 3), ("c", 1)) for i in range(n)}
+    engine.reset(list(jobs.values()))
+    assert engine.stats(k=2)["jobs_per_company"] == {"a": 5, "b": 3}
+
+    fewer = {key: job for key, job in jobs.items() if not key.startswith("a") or key in ("a0", "a1")}
+    engine.update(jobs, fewer)
+
+    assert engine.stats()["jobs_per_company"] == {"b": 3, "a": 2, "c": 1}
+    assert engine.stats(k=1)["jobs_per_company"] == {"b": 3}
@@ -0,0 +1,30 @@
+import pytest
+
+from app.filters import CATEGORY_ON_SITE_KSA, CATEGORY_REMOTE, classify_job, filter_ksa_remote
+
+# A multi-word keyword ("work from home") split over two adjacent scanned fields (location, job
+# type, title, description) must not count as a match.
+CROSS_FIELD = [
+    {"title": "Lead for work", "location": "Berlin", "description": "from home country relocation"},
+    {"location": "Berlin, work", "jobType": "from home", "title": "Engineer"},
+    {"location": "Berlin", "jobType": "work", "title": "from home office"},
+    {"location": "Berlin", "jobType": "contract", "title": "Lead for work from", "description": "home country"},
+]
+
+
+@pytest.mark.parametrize("job", CROSS_FIELD)
+def test_keywords_do_not_match_across_fields(job):
+    assert classify_job(job) == ""
+    assert filter_ksa_remote(job) is False
+
+
+@pytest.mark.parametrize("job, category", [
+    ({"title": "Engineer", "location": "Berlin", "description": "Work  from home"}, CATEGORY_REMOTE),
+    ({"title": "Engineer", "location": "Berlin", "jobType": "100% remote"}, CATEGORY_REMOTE),
+    ({"title": "Engineer", "location": "Riyadh"}, CATEGORY_ON_SITE_KSA),
+    ({"title": "Engineer", "location": "Riyadh", "remote": True}, CATEGORY_REMOTE),
+    ({"title": "Engineer", "location": "Berlin"}, ""),
+])
+def test_classify_job_agrees_with_filter(job, category):
+    assert classify_job(job) == category
+    assert filter_ksa_remote(job) is bool(category)
@@ -0,0 +1,61 @@
+import asyncio
+
+import httpx
+
+from app.http_cache import HTTPCache, http_cache
+from app.utils import async_get_json
+
+URL = "https://upstream.test/jobs"
+
+
+def _response(body: bytes) -> httpx.Response:
+    return httpx.Response(200, headers={"ETag": '"v1"'}, content=body)
+
+
+def test_stored_entry_keeps_only_the_decoded_value(tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache.db"))
+    value = {"data": [1, 2, 3]}
+
+    asyncio.run(cache.store("k", _response(b'{"data":[1,2,3]}'), value))
+
+    entry = cache._entries["k"]
+    assert entry.body is None
+    assert entry.value is value
+
+
+def test_restored_entry_drops_the_body_once_decoded(tmp_path):
+    path = str(tmp_path / "cache.db")
+    asyncio.run(HTTPCache(path).store("k", _response(b'{"data":[1,2,3]}'), {"data": [1, 2, 3]}))
+    # A restart: the new process only has what was written to SQLite.
+    cache = HTTPCache(path)
+
+    entry = asyncio.run(cache.lookup("k"))
+    assert entry.body == b'{"data":[1,2,3]}'
+    assert entry.value is None
+
+    assert cache.not_modified(entry) == {"data": [1, 2, 3]}
+    assert entry.body is None
+    assert cache.not_modified(entry) is entry.value
+
+
+def test_not_modified_returns_the_same_object(upstream):
+    responses = iter([
+        httpx.Response(200, headers={"ETag": '"v1"'}, json={"jobs": ["a"]}),
+        httpx.Response(304),
+    ])
+    conditional = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        conditional.append(request.headers.get("If-None-Match"))
+        return next(responses)
+
+    upstream(handler)
+
+    async def main():
+        return await async_get_json(URL), await async_get_json(URL)
+
+    first, second = asyncio.run(main())
+
+    assert conditional == [None, '"v1"']
+    assert second is first
+    assert all(entry is None or entry.body is None for entry in http_cache._entries.values())
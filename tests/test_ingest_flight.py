@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from app import job_service
+from app.config import settings
+from app.singleflight import SingleFlight
+
+SOURCE_HOSTS = {
+    "www.arbeitnow.com",
+    "jobicy.com",
+    "remotive.com",
+    "api.adzuna.com",
+    "jooble.org",
+    "public.api.careerjet.net",
+}
+
+
+def _empty_sources(hits: Counter):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        hits[request.url.host] += 1
+        # Slow enough that every caller arrives while the first ingest is running.
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"data": [], "jobs": [], "results": []})
+
+    return handler
+
+
+def test_concurrent_ingests_hit_each_source_once(upstream, monkeypatch):
+    monkeypatch.setattr(job_service, "ingest_flight", SingleFlight("fetch_all_jobs"))
+    hits: Counter = Counter()
+    upstream(_empty_sources(hits))
+
+    async def main():
+        return await asyncio.gather(*[job_service.fetch_all_jobs() for _ in range(20)])
+
+    results = asyncio.run(main())
+
+    assert hits == Counter({host: 1 for host in SOURCE_HOSTS})
+    assert all(result is results[0] for result in results)
+    assert job_service.ingest_flight.calls == 1
+    assert job_service.ingest_flight.coalesced == 19
+
+
+def test_ingest_after_the_last_one_settled_starts_a_new_run(upstream, monkeypatch):
+    monkeypatch.setattr(job_service, "ingest_flight", SingleFlight("fetch_all_jobs"))
+    hits: Counter = Counter()
+    upstream(_empty_sources(hits))
+
+    async def main():
+        await job_service.fetch_all_jobs()
+        await job_service.fetch_all_jobs()
+
+    asyncio.run(main())
+
+    assert job_service.ingest_flight.calls == 2
+    # The second run is answered from the per-source cache.
+    assert hits == Counter({host: 1 for host in SOURCE_HOSTS})
+
+
+def test_near_dedup_runs_off_the_event_loop(upstream, monkeypatch):
+    upstream(_empty_sources(Counter()))
+
+    def slow_collapse(jobs):
+        time.sleep(0.5)
+        return jobs, 0
+
+    monkeypatch.setattr(job_service, "collapse_near_duplicates", slow_collapse)
+    monkeypatch.setattr(settings, "NEAR_DEDUP_ENABLED", True)
+
+    async def main():
+        gaps = []
+        ingest = asyncio.ensure_future(job_service.fetch_all_jobs())
+        last = time.monotonic()
+        while not ingest.done():
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            gaps.append(now - last)
+            last = now
+        await ingest
+        return max(gaps)
+
+    assert asyncio.run(main()) < 0.2
@@ -0,0 +1,63 @@
+import asyncio
+
+from app.job_store import JobStore
+
+
+def _publish(store: JobStore, jobs, **kwargs):
+    return asyncio.run(store.publish(jobs, **kwargs))
+
+
+def test_edited_job_is_delivered_by_changes(make_job):
+    store = JobStore()
+    _publish(store, [make_job("a"), make_job("b")])
+    edited = make_job("a", description="Now hiring in Jeddah too")
+
+    snapshot = _publish(store, [edited, make_job("b")])
+
+    assert snapshot.version == 2
+    assert snapshot.added_in == {"a": 2, "b": 1}
+    delta = store.changes(1)
+    assert delta["added"] == [edited]
+    assert delta["removed"] == []
+    assert store.changes(2)["added"] == []
+
+
+def test_changes_reports_added_and_removed(make_job):
+    store = JobStore()
+    _publish(store, [make_job("a"), make_job("b")])
+    _publish(store, [make_job("b"), make_job("c")])
+
+    delta = store.changes(1)
+
+    assert [job.dedup_key for job in delta["added"]] == ["c"]
+    assert delta["removed"] == ["a"]
+
+
+def test_identical_ingest_keeps_the_version(make_job):
+    store = JobStore()
+    first = _publish(store, [make_job("a"), make_job("b")])
+
+    again = _publish(store, [make_job("a"), make_job("b")])
+
+    assert again is first
+    assert store.changes(1)["added"] == []
+
+
+def test_edited_job_moves_in_the_stats(make_job):
+    store = JobStore()
+    _publish(store, [make_job("a", jobCategory="Remote")])
+
+    _publish(store, [make_job("a", jobCategory="On-site KSA")])
+
+    assert store.analytics.stats(category="remote")["total_jobs"] == 0
+    assert store.analytics.stats(category="on-site ksa")["total_jobs"] == 1
+
+
+def test_reordered_ingest_keeps_the_version(make_job):
+    store = JobStore()
+    first = _publish(store, [make_job("a"), make_job("b"), make_job("c")])
+
+    again = _publish(store, [make_job("c"), make_job("a"), make_job("b")])
+
+    assert again is first
+    assert store.changes(1) == {"version": 1, "reset": False, "added": [], "removed": []}
@@ -0,0 +1,35 @@
+import asyncio
+
+from app import job_service
+from app.config import settings
+from app.offload import offloader
+
+
+def _page(n: int, size: int = 3) -> list:
+    return [
+        {"title": f"Engineer {n}-{i}", "company_name": "Acme", "candidate_required_location": "Worldwide",
+         "url": f"https://jobs.test/{n}/{i}", "description": "Remote role"}
+        for i in range(size)
+    ]
+
+
+def test_jobs_keep_page_order_with_parallel_normalize_workers(monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_NORMALIZE_WORKERS", 4)
+    monkeypatch.setattr(settings, "INGEST_QUEUE_SIZE", 4)
+    monkeypatch.setattr(offloader, "mode", "thread")
+    normalize_page = job_service._normalize_page
+
+    async def slow_first_pages(src_name, raw, previous):
+        # Earlier pages take longer, so they finish after the later ones.
+        await asyncio.sleep(0.02 * (5 - int(raw[0]["title"].split()[1].split("-")[0])))
+        return normalize_page(src_name, raw, previous)
+
+    monkeypatch.setattr(job_service, "_normalize_page_offloaded", slow_first_pages)
+
+    async def pages():
+        for n in range(1, 5):
+            yield _page(n)
+
+    jobs = asyncio.run(job_service._load_client("remotive", pages))
+
+    assert [job.title for job in jobs] == [f"Engineer {n}-{i}" for n in range(1, 5) for i in range(3)]
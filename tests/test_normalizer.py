@@ -0,0 +1,38 @@
+import pytest
+
+from app.filters import filter_ksa_remote
+from app.normalizer import filter_and_normalize, normalize_job
+
+ITEMS = [
+    # "work from home" split over adjacent scanned fields: rejected by filter_ksa_remote.
+    {"title": "Lead for work", "location": "Berlin", "description": "from home country relocation",
+     "url": "https://jobs.test/1", "company_name": "Acme"},
+    {"title": "Engineer", "location": "Berlin, work", "job_type": "from home",
+     "url": "https://jobs.test/2", "company_name": "Acme"},
+    {"title": "Engineer", "location": "Berlin", "description": "Work from home",
+     "url": "https://jobs.test/3", "company_name": "Acme"},
+    {"title": "Engineer", "location": "Riyadh, Saudi Arabia", "url": "https://jobs.test/4", "company_name": "Acme"},
+    {"title": "Engineer", "location": "Berlin", "url": "https://jobs.test/5", "company_name": "Acme"},
+]
+
+
+def _baseline(raw_items, source):
+    return [normalize_job(item, source) for item in raw_items if filter_ksa_remote(item)]
+
+
+@pytest.mark.parametrize("source", ["remotive", "arbeitnow", "jooble"])
+def test_fused_stage_matches_filter_then_normalize(source):
+    kept = filter_and_normalize(ITEMS, source)
+
+    assert kept == _baseline(ITEMS, source)
+    assert [job["url"] for job in kept] == ["https://jobs.test/3", "https://jobs.test/4"]
+
+
+def test_fused_stage_matches_for_adzuna():
+    items = [
+        {"title": item["title"], "company": {"display_name": "Acme"}, "redirect_url": item["url"],
+         "location": {"display_name": item["location"]}, "description": item.get("description", "")}
+        for item in ITEMS
+    ]
+
+    assert filter_and_normalize(items, "adzuna") == _baseline(items, "adzuna")
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from typing import List
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.retry import deadline_budget
+from app.utils import UpstreamError, async_get_json
+
+URL = "https://upstream.test/jobs"
+
+
+class Scripted:
+    """Answers each request with the next (status, headers) in the script; 200 once it runs out."""
+
+    def __init__(self, *script, delay: float = 0.0):
+        self.script = list(script)
+        self.delay = delay
+        self.attempts = 0
+        self.times: List[float] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.attempts += 1
+        self.times.append(time.monotonic())
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        status, headers = self.script.pop(0) if self.script else (200, {})
+        return httpx.Response(status, headers=headers, json={"ok": status == 200})
+
+
+def _get(**kwargs):
+    return asyncio.run(async_get_json(URL, raise_errors=True, **kwargs))
+
+
+def _bounded_get(seconds: float):
+    async def main():
+        with deadline_budget(seconds):
+            return await async_get_json(URL, raise_errors=True)
+
+    return asyncio.run(main())
+
+
+def test_permanent_error_is_not_retried(upstream):
+    stub = Scripted((400, {}))
+    upstream(stub)
+
+    with pytest.raises(UpstreamError):
+        _get()
+
+    assert stub.attempts == 1
+
+
+def test_transient_errors_are_retried_until_success(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_RETRIES", 3)
+    stub = Scripted((503, {}), (503, {}))
+    upstream(stub)
+
+    assert _get() == {"ok": True}
+    assert stub.attempts == 3
+
+
+def test_gives_up_after_max_attempts(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_RETRIES", 3)
+    stub = Scripted((503, {}), (503, {}), (503, {}), (503, {}))
+    upstream(stub)
+
+    with pytest.raises(UpstreamError):
+        _get()
+
+    assert stub.attempts == 3
+
+
+def test_retry_after_is_honoured(upstream):
+    stub = Scripted((429, {"Retry-After": "0.3"}))
+    upstream(stub)
+
+    assert _get() == {"ok": True}
+    assert stub.attempts == 2
+    # Far above the jittered backoff the fixture configures (<= 0.02s).
+    assert stub.times[1] - stub.times[0] >= 0.3
+
+
+def test_retry_after_beyond_the_cap_gives_up(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_AFTER_MAX_SECONDS", 5.0)
+    stub = Scripted((429, {"Retry-After": "120"}))
+    upstream(stub)
+
+    with pytest.raises(UpstreamError):
+        _get()
+
+    assert stub.attempts == 1
+
+
+def test_deadline_budget_cuts_off_a_slow_attempt(upstream):
+    upstream(Scripted(delay=2.0))
+
+    start = time.monotonic()
+    with pytest.raises(UpstreamError):
+        _bounded_get(0.2)
+
+    assert time.monotonic() - start < 1.0
+
+
+def test_deadline_budget_skips_a_retry_it_cannot_afford(upstream):
+    stub = Scripted((429, {"Retry-After": "2"}))
+    upstream(stub)
+
+    start = time.monotonic()
+    with pytest.raises(UpstreamError):
+        _bounded_get(0.5)
+
+    assert stub.attempts == 1
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,51 @@
+import random
+
+from app.dedup import collapse_near_duplicates
+from app.job_service import StreamDedup
+
+VOCAB = [f"w{i}" for i in range(2000)]
+
+
+def _corpus(make_job, n: int, reposts: int):
+    rng = random.Random(3)
+    originals = [
+        make_job(f"Engineer {i}", company=f"Company {i % 7}", url=f"https://a.test/{i}",
+                 description=" ".join(rng.choices(VOCAB, k=60)))
+        for i in range(n)
+    ]
+    copies = []
+    for i in rng.sample(range(n), reposts):
+        words = originals[i].description.split()
+        words[0] = "exciting"
+        copies.append(make_job(f"{originals[i].title} (Remote)", company=f"{originals[i].company}, Inc.",
+                               source="jobicy", url=f"https://b.test/{i}", description=" ".join(words)))
+    return originals, copies
+
+
+def test_streamed_batches_match_a_full_collapse(make_job):
+    originals, copies = _corpus(make_job, 60, 20)
+    batches = [originals[:30], copies[:10] + originals[30:], copies[10:]]
+
+    dedup = StreamDedup()
+    sent = []
+    for batch in batches:
+        added, removed = dedup.add(batch)
+        assert removed == []
+        sent.extend(added)
+
+    kept, folded = collapse_near_duplicates([job for batch in batches for job in batch])
+    assert folded == 20
+    assert dedup.jobs == kept
+    assert sent == kept
+    assert dedup.total == len(kept)
+
+
+def test_a_later_repost_is_not_sent(make_job):
+    originals, copies = _corpus(make_job, 5, 1)
+    dedup = StreamDedup()
+    dedup.add(originals)
+
+    added, removed = dedup.add(copies)
+
+    assert (added, removed) == ([], [])
+    assert dedup.total == 5
@@ -0,0 +1,122 @@
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+
+from app import job_service
+from app.api_clients import JobAPIClients, walk_pages
+from app.config import settings
+from app.utils import UpstreamError
+
+PAGE_SIZE = 3
+
+
+class Arbeitnow:
+    """Stub arbeitnow board: `last_page` full pages, then an optional short one."""
+
+    def __init__(self, last_page: int, short_page: int = 0, failing_page: int = 0, latency=lambda page: 0.01):
+        self.last_page = last_page
+        self.short_page = short_page
+        self.failing_page = failing_page
+        self.latency = latency
+        self.requested: List[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        self.requested.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency(page))
+        finally:
+            self.in_flight -= 1
+        if page == self.failing_page:
+            return httpx.Response(404)
+        if page <= self.last_page:
+            size = PAGE_SIZE
+        elif page == self.last_page + 1:
+            size = self.short_page
+        else:
+            size = 0
+        return httpx.Response(200, json={"data": [{"slug": f"{page}-{i}"} for i in range(size)]})
+
+
+def _walk(**kwargs) -> List[list]:
+    async def main():
+        return [page async for page in walk_pages(JobAPIClients.fetch_arbeitnow, **kwargs)]
+
+    return asyncio.run(main())
+
+
+def test_stops_after_a_short_page(upstream):
+    board = Arbeitnow(last_page=2, short_page=1)
+    upstream(board)
+
+    pages = _walk(max_pages=10, concurrency=1)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert board.requested == [1, 2, 3]
+
+
+def test_page_requests_are_bounded_by_concurrency(upstream):
+    board = Arbeitnow(last_page=20)
+    upstream(board)
+
+    pages = _walk(max_pages=12, concurrency=3)
+
+    assert len(pages) == 12
+    assert board.max_in_flight == 3
+    assert sorted(board.requested) == list(range(1, 13))
+
+
+def test_stops_at_max_pages(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_PAGES", 4)
+    board = Arbeitnow(last_page=20)
+    upstream(board)
+
+    pages = _walk()
+
+    assert len(pages) == 4
+    assert sorted(board.requested) == [1, 2, 3, 4]
+
+
+def test_pages_are_yielded_in_page_order(upstream):
+    # Later pages answer first.
+    board = Arbeitnow(last_page=9, short_page=2, latency=lambda page: 0.05 / page)
+    upstream(board)
+
+    pages = _walk(max_pages=20, concurrency=4)
+
+    assert [page[0]["slug"] for page in pages] == [f"{n}-0" for n in range(1, 11)]
+    assert len(pages[-1]) == 2
+
+
+def test_a_failure_past_the_last_page_is_ignored(upstream):
+    # Page 4 fails fast while the short page 3 is still loading.
+    board = Arbeitnow(last_page=2, short_page=1, failing_page=4, latency=lambda page: 0.05 if page == 3 else 0.0)
+    upstream(board)
+
+    pages = _walk(max_pages=10, concurrency=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+
+def test_a_failing_later_page_fails_the_walk(upstream):
+    upstream(Arbeitnow(last_page=20, failing_page=3))
+
+    with pytest.raises(UpstreamError):
+        _walk(max_pages=6, concurrency=1)
+
+
+def test_a_failing_later_page_is_not_cached_as_a_load(upstream):
+    upstream(Arbeitnow(last_page=20, failing_page=3))
+    name, pages = job_service.CLIENTS[0]
+    assert name == "arbeitnow"
+
+    jobs = asyncio.run(job_service._run_client(name, pages))
+
+    assert jobs == []
+    assert name not in job_service.source_cache._entries